@@ -32,27 +32,42 @@ __email__ = "justadudeinspace@example.com"
 __license__ = "MIT"
 __copyright__ = "Copyright 2024 LRC Project"
 
+import importlib
 import sys
-from typing import TYPE_CHECKING
-
-# Public API imports
-from .core import (
-    ParseError,
-    do_bootstrap,
-    get_default_output_dir,
-    parse_schema,
-    print_platform_info,
-    realize,
-)
-
-from .audit import run_dat_audit
-from .cli import main as cli_main
+from typing import TYPE_CHECKING, Any
 
 # Re-export types for public API
 if TYPE_CHECKING:
-    from .core import Action, GenerationResult
+    from .audit import run_dat_audit
+    from .cli.main import main as cli_main
+    from .core import (
+        Action,
+        GenerationResult,
+        ParseError,
+        do_bootstrap,
+        get_default_output_dir,
+        parse_schema,
+        print_platform_info,
+        realize,
+    )
     from .compiler import BuildPlan
 
+# Public API imports, resolved lazily on first attribute access (PEP 562)
+# so that ``import lrc`` for ``__version__`` does not load the submodules.
+_LAZY_EXPORTS: dict[str, tuple[str, str]] = {
+    "parse_schema": (".core", "parse_schema"),
+    "realize": (".core", "realize"),
+    "get_default_output_dir": (".core", "get_default_output_dir"),
+    "print_platform_info": (".core", "print_platform_info"),
+    "do_bootstrap": (".core", "do_bootstrap"),
+    "ParseError": (".core", "ParseError"),
+    "Action": (".core", "Action"),
+    "GenerationResult": (".core", "GenerationResult"),
+    "BuildPlan": (".compiler", "BuildPlan"),
+    "run_dat_audit": (".audit", "run_dat_audit"),
+    "cli_main": (".cli", "main"),
+}
+
 # Public API exports
 __all__ = [
     # Core functionality
@@ -78,6 +93,37 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str) -> Any:
+    """
+    Resolve public API attributes on first access.
+    
+    Args:
+        name: Attribute requested from the package
+        
+    Returns:
+        The exported object, cached in the module namespace
+        
+    Raises:
+        AttributeError: If the name is not exported or cannot be imported
+    """
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    except (ImportError, AttributeError) as exc:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from exc
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
 def get_version_info() -> dict[str, str]:
     """
     Get comprehensive version information for debugging and support.
@@ -226,29 +272,6 @@ def _initialize_package() -> None:
         setup_logging('DEBUG')
 
 
-# Backwards compatibility imports
-# These ensure that existing code continues to work after refactoring
-try:
-    from .core import Action
-    __all__.append('Action')
-except ImportError:
-    # Action might be defined elsewhere or not available
-    pass
-
-try:
-    from .compiler import BuildPlan
-    __all__.append('BuildPlan')
-except ImportError:
-    # BuildPlan might be defined elsewhere or not available  
-    pass
-
-try:
-    from .core import GenerationResult
-    __all__.append('GenerationResult')
-except ImportError:
-    # GenerationResult might be defined elsewhere or not available
-    pass
-
 # Initialize package on import
 _initialize_package()
 
@@ -264,7 +287,9 @@ def main() -> int:
         >>> from lrc import main
         >>> exit_code = main()
     """
-    return cli_main()
+    from .cli.main import main as run_cli
+
+    return run_cli()
 
 
 # Allow direct execution: python -m lrc
@@ -3,14 +3,14 @@
 from __future__ import annotations
 
 import argparse
+import re
 import sys
 from pathlib import Path
 from typing import Optional
 
 from .. import core
 from ..audit import run_dat_audit
-from ..parser import ParseError, parse_schema
-from ..compiler import realize
+from ..core import ParseError, parse_schema, realize
 
 RESET = "\033[0m"
 RED = "\033[31m"
@@ -18,6 +18,11 @@ GREEN = "\033[32m"
 YELLOW = "\033[33m"
 CYAN = "\033[36m"
 
+# [ \t] rather than \s so the match never runs on into the next line.
+_PROJECT_RE = re.compile(
+    rb"^[ \t]*#[ \t]*project[ \t]*:[ \t]*(.*)$", re.IGNORECASE | re.MULTILINE
+)
+
 
 def colorize(message: str, color: str) -> str:
     if not sys.stdout.isatty():
@@ -85,6 +90,21 @@ def _print_error_context(path: Path, line_num: int, message: str, snippet: str)
 
 
 def main(argv: Optional[list[str]] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Answer the trivial queries without building the argparse parser.
+    if argv == ["--version"]:
+        print(f"lrc version {core.__version__}")
+        return 0
+    if (
+        argv
+        and argv[0] == "--platform-info"
+        and argv[1:] in ([], ["-v"], ["--verbose"])
+    ):
+        core.print_platform_info(verbose=True)
+        return 0
+
     parser = build_parser()
     args = parser.parse_args(argv)
 
@@ -113,15 +133,23 @@ def main(argv: Optional[list[str]] = None) -> int:
     base_dir = Path(args.base_dir) if args.base_dir else schema_path.parent
     base_dir = base_dir.resolve()
 
+    # Read once; the parse below reuses the bytes when they were needed
+    # here for the default output directory.
+    schema_bytes: Optional[bytes] = None
     if args.output:
         out_root = Path(args.output).resolve()
     else:
-        schema_text = schema_path.read_text(encoding="utf-8")
-        project_name = None
-        for line in schema_text.splitlines():
-            if line.strip().lower().startswith("# project:"):
-                project_name = line.split(":", 1)[1].strip()
-                break
+        try:
+            schema_bytes = schema_path.read_bytes()
+        except OSError as exc:
+            print(colorize(f"[ERROR] {exc}", RED))
+            return 1
+        match = _PROJECT_RE.search(schema_bytes)
+        project_name = (
+            match.group(1).decode("utf-8", errors="replace").strip() or None
+            if match
+            else None
+        )
         out_root = core.get_default_output_dir(project_name)
 
     fs_ok, fs_msg = core.check_fs_ok(out_root)
@@ -139,9 +167,10 @@ def main(argv: Optional[list[str]] = None) -> int:
         print(f"[INFO] Audit: {args.audit}")
 
     try:
-        schema_text = schema_path.read_text(encoding="utf-8")
+        if schema_bytes is None:
+            schema_bytes = schema_path.read_bytes()
         actions, meta, vars_ = parse_schema(
-            schema_text, out_root, base_dir, args.verbose
+            schema_bytes, out_root, base_dir, args.verbose
         )
         _display_metadata(meta)
 
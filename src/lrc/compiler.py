@@ -12,8 +12,9 @@ import platform
 import re
 import shutil
 import subprocess
+import warnings
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from .parser import (
     Action,
@@ -24,12 +25,16 @@ from .parser import (
     parse_schema,
 )
 
+if TYPE_CHECKING:
+    from . import core
+
 __all__ = [
     "BuildPlan",
     "ParseError",
     "compile_schema_path",
     "get_default_output_dir",
     "print_platform_info",
+    "realize",
     "resolve_output_directory",
     "SYSTEM",
 ]
@@ -106,8 +111,7 @@ def compile_schema_path(
 
     schema_signature = verify_schema_signature(schema_path, verbose=verbose)
 
-    text = schema_path.read_text(encoding="utf-8")
-    result = parse_schema(text, out_dir, schema_path.parent, verbose=verbose)
+    result = parse_schema(schema_path.read_bytes(), out_dir, schema_path.parent, verbose=verbose)
 
     metadata = {k: (v or "") for k, v in result.metadata.items()}
 
@@ -216,6 +220,30 @@ def build_metadata(plan: BuildPlan) -> Dict[str, object]:
     return data
 
 
+def realize(
+    actions: List["core.Action"],
+    base_dir: Path,
+    dry_run: bool = False,
+    force: bool = False,
+    verbose: bool = False,
+) -> "core.GenerationResult":
+    """Deprecated: execute ``lrc.core`` actions; use ``lrc.core.realize``.
+
+    Kept from the former ``lrc.compiler`` package, which only delegated to
+    ``lrc.core``.  New code builds a :class:`BuildPlan` and hands it to
+    :func:`lrc.generator.realize`.
+    """
+
+    warnings.warn(
+        "lrc.compiler.realize is deprecated; use lrc.core.realize or lrc.generator.realize",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    from .core import realize as _realize
+
+    return _realize(actions, base_dir, dry_run, force, verbose)
+
+
 def _is_termux() -> bool:
     return "com.termux" in os.environ.get("PREFIX", "")
 
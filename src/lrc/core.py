@@ -9,6 +9,7 @@ Cross-platform support for: Android/Termux, Android/Linux, Linux, WSL2, macOS, W
 from __future__ import annotations
 
 from dataclasses import dataclass
+import functools
 from pathlib import Path
 import sys
 import os
@@ -19,7 +20,7 @@ import re
 import fnmatch
 import json
 import subprocess
-from typing import List, Optional, Tuple, Literal, Dict, Any, Set
+from typing import List, Optional, Tuple, Literal, Dict, Any, Set, Union
 import hashlib
 import tempfile
 
@@ -631,13 +632,16 @@ class ParserState:
 
 
 def parse_schema(
-    schema_text: str, out_root: Path, base_dir: Path, verbose: bool = False
+    schema_text: Union[str, bytes],
+    out_root: Path,
+    base_dir: Path,
+    verbose: bool = False,
 ) -> Tuple[List[Action], Dict[str, Optional[str]], Dict[str, str]]:
     """
     Parse schema text into actions, metadata, and variables.
     
     Args:
-        schema_text: Schema content as string
+        schema_text: Schema content as string, or raw UTF-8 bytes
         out_root: Root directory for output
         base_dir: Base directory for relative includes
         verbose: Enable verbose output
@@ -651,6 +655,8 @@ def parse_schema(
     st = ParserState(out_root)
     st.base_dir = base_dir
     st.trusted_templates = load_trusted_templates(base_dir)
+    if isinstance(schema_text, bytes):
+        schema_text = schema_text.decode("utf-8")
     lines = schema_text.splitlines()
 
     # First pass: extract metadata and variables
@@ -899,7 +905,7 @@ def _handle_inline_file(
 
     if verbose:
         print(f"[PARSE] L{line_num}: file {target_path} (inline, {len(content)} chars)")
-    return line_num + 1
+    return line_num
 
 
 def _handle_plain_file(
@@ -926,7 +932,7 @@ def _handle_plain_file(
 
     if verbose:
         print(f"[PARSE] L{line_num}: file {target_path} (empty)")
-    return line_num + 1
+    return line_num
 
 
 def _handle_directive(
@@ -1121,6 +1127,66 @@ def coalesce_mkdirs(actions: List[Action]) -> List[Action]:
 
 # ----------------------------- Realization ---------------------------------
 
+def _collect_directories(actions: List[Action], base_dir: Path) -> List[Path]:
+    """
+    Collect the unique directories required by a list of actions.
+    
+    Args:
+        actions: List of actions to inspect
+        base_dir: Base directory for security checks
+        
+    Returns:
+        Safe directories sorted shallowest first, leaving out any directory
+        at or under a path that a symlink action will create
+    """
+    dirs: Set[Path] = set()
+    links: List[Path] = []
+    for act in actions:
+        if act.kind == "mkdir":
+            dirs.add(act.path)
+        elif act.kind in ("write", "copy", "symlink"):
+            dirs.add(act.path.parent)
+        if act.kind == "symlink":
+            links.append(act.path)
+
+    def behind_link(directory: Path) -> bool:
+        return any(directory == link or link in directory.parents for link in links)
+
+    return sorted(
+        (d for d in dirs if not behind_link(d) and is_safe_under_base(d, base_dir)),
+        key=lambda d: len(d.parts),
+    )
+
+
+def _exists(path: Path, children: Dict[Path, Set[str]]) -> bool:
+    """Check for ``path`` using cached directory listings when available.
+
+    The listings compare names case-sensitively, so on platforms whose
+    filesystems usually fold case a miss is confirmed with a real lookup.
+    """
+    names = children.get(path.parent)
+    if names is None:
+        return path.exists()
+    if path.name in names:
+        return True
+    return (IS_WINDOWS or IS_MACOS) and path.exists()
+
+
+def _remember(path: Path, children: Dict[Path, Set[str]]) -> None:
+    """Record a newly created entry in the cached directory listings."""
+    names = children.get(path.parent)
+    if names is not None:
+        names.add(path.name)
+
+
+def _ensure_parent(path: Path, made_dirs: Set[Path]) -> None:
+    """Create ``path``'s parent unless the directory pre-pass already did."""
+    parent = path.parent
+    if parent not in made_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        made_dirs.add(parent)
+
+
 def realize(
     actions: List[Action],
     base_dir: Path,
@@ -1146,6 +1212,21 @@ def realize(
     errors: List[str] = []
     warnings: List[str] = []
 
+    # Create every required directory exactly once before the main pass
+    made_dirs: Set[Path] = set()
+    children: Dict[Path, Set[str]] = {}
+    if not dry_run:
+        for directory in _collect_directories(actions, base_dir):
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(directory)
+                _remember(directory, children)
+                with os.scandir(directory) as entries:
+                    children[directory] = {entry.name for entry in entries}
+            except OSError:
+                # Reported by the action that needs the directory
+                pass
+
     for act in actions:
         try:
             # Enhanced security check
@@ -1160,7 +1241,8 @@ def realize(
                 if verbose or dry_run:
                     print(f"[{'DRY' if dry_run else 'MKDIR'}] {act.path}")
                 if not dry_run:
-                    act.path.mkdir(parents=True, exist_ok=True)
+                    if act.path not in made_dirs:
+                        act.path.mkdir(parents=True, exist_ok=True)
                     actions_performed += 1
 
             elif act.kind == "write":
@@ -1170,14 +1252,24 @@ def realize(
                         f"[{'DRY' if dry_run else 'WRITE'}] {act.path} ({size} bytes)"
                     )
                 if not dry_run:
-                    if act.path.exists() and not force:
+                    if _exists(act.path, children) and not force:
                         warning_msg = f"Skipping existing file (use --force to overwrite): {act.path}"
                         warnings.append(warning_msg)
                         if verbose:
                             print(f"[WARN] {warning_msg}")
                         continue
-                    act.path.parent.mkdir(parents=True, exist_ok=True)
-                    act.path.write_text(act.content or "", encoding="utf-8")
+                    _ensure_parent(act.path, made_dirs)
+                    # "x" (O_EXCL) refuses an entry that appeared after the check.
+                    try:
+                        with open(act.path, "w" if force else "x", encoding="utf-8") as fh:
+                            fh.write(act.content or "")
+                    except FileExistsError:
+                        warning_msg = f"Skipping existing file (use --force to overwrite): {act.path}"
+                        warnings.append(warning_msg)
+                        if verbose:
+                            print(f"[WARN] {warning_msg}")
+                        continue
+                    _remember(act.path, children)
                     actions_performed += 1
 
             elif act.kind == "chmod":
@@ -1193,7 +1285,7 @@ def realize(
                 if verbose or dry_run:
                     print(f"[{'DRY' if dry_run else 'COPY'}] {act.src} -> {act.path}")
                 if not dry_run:
-                    if act.path.exists() and not force:
+                    if _exists(act.path, children) and not force:
                         warning_msg = f"Skipping existing file (use --force to overwrite): {act.path}"
                         warnings.append(warning_msg)
                         if verbose:
@@ -1208,8 +1300,9 @@ def realize(
                             print(f"[SECURITY] {error_msg}")
                         continue
 
-                    act.path.parent.mkdir(parents=True, exist_ok=True)
+                    _ensure_parent(act.path, made_dirs)
                     shutil.copy2(act.src, act.path)
+                    _remember(act.path, children)
                     actions_performed += 1
 
             elif act.kind == "symlink":
@@ -1218,7 +1311,7 @@ def realize(
                         f"[{'DRY' if dry_run else 'SYMLINK'}] {act.target} -> {act.path}"
                     )
                 if not dry_run:
-                    if act.path.exists():
+                    if _exists(act.path, children):
                         if force:
                             act.path.unlink()
                         else:
@@ -1227,8 +1320,9 @@ def realize(
                             if verbose:
                                 print(f"[WARN] {warning_msg}")
                             continue
-                    act.path.parent.mkdir(parents=True, exist_ok=True)
+                    _ensure_parent(act.path, made_dirs)
                     act.path.symlink_to(act.target)
+                    _remember(act.path, children)
                     actions_performed += 1
 
         except Exception as e:
@@ -1266,21 +1360,23 @@ def detect_install_bin() -> Path:
         return Path.home() / ".local" / "bin"
 
 
+@functools.lru_cache(maxsize=None)
+def _rc_files_for(shell: str) -> Tuple[Path, ...]:
+    """Resolve the shell startup files to update for a given shell."""
+    home = Path.home()
+    if shell == "zsh":
+        return (home / ".zshrc", home / ".zprofile")
+    if shell == "bash":
+        return (home / ".bashrc", home / ".bash_profile", home / ".profile")
+    if shell == "fish":
+        return (home / ".config" / "fish" / "config.fish",)
+    return (home / ".profile",)
+
+
 def persist_path(bin_dir: Path, verbose: bool = False) -> None:
     """Persist PATH configuration for various shells."""
     export_line = f'export PATH="{bin_dir}:$PATH"'
 
-    shell_rc_files = {
-        "zsh": [Path.home() / ".zshrc", Path.home() / ".zprofile"],
-        "bash": [
-            Path.home() / ".bashrc",
-            Path.home() / ".bash_profile",
-            Path.home() / ".profile",
-        ],
-        "fish": [Path.home() / ".config" / "fish" / "config.fish"],
-        "default": [Path.home() / ".profile"],
-    }
-
     def add_to_file(file_path: Path, content: str):
         try:
             file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -1306,8 +1402,7 @@ def persist_path(bin_dir: Path, verbose: bool = False) -> None:
         else "default"
     )
 
-    target_files = shell_rc_files.get(shell, shell_rc_files["default"])
-    for rc_file in target_files:
+    for rc_file in _rc_files_for(shell):
         add_to_file(rc_file, export_line)
 
 
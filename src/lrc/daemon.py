@@ -0,0 +1,376 @@
+"""Opt-in background server that keeps LRC's modules imported between runs.
+
+With ``LRC_DAEMON=1`` set, ``lrc`` first tries to hand its argv to a running
+server over a Unix socket. The server forks a child per request. The child
+adopts the client's cwd, umask, environment and stdio descriptors, then runs
+:func:`lrc.main.main`, so the client pays neither interpreter start-up nor
+import cost. If no server answers, the invocation runs locally and a server
+is spawned in the background for the next call. A server that fails to start
+records why in ``FAILED_PATH``, and clients stop spawning new ones for
+``SPAWN_BACKOFF`` seconds.
+
+Settings that LRC reads from the environment at import time (``LRC_*``, home
+and XDG directories) are frozen in the server, so a client whose values differ
+from the server's is told to run locally instead. The server exits after
+``IDLE_TIMEOUT`` seconds without a request, or when :func:`stop` is called.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import stat
+import sys
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from multiprocessing.reduction import recv_handle, send_handle
+from pathlib import Path
+from types import FrameType
+from typing import Callable, Dict, List, Mapping, NoReturn, Optional
+
+from . import __version__
+
+ENV_FLAG = "LRC_DAEMON"
+# Version-stamped so an upgraded install never talks to a stale server.
+SOCKET_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "lrc"
+    / f"sock-{__version__}"
+)
+# Per-server secret for the connection handshake; readable by the owner only.
+KEY_PATH = SOCKET_PATH.with_name(SOCKET_PATH.name + ".key")
+# Why the last server failed to start; its mtime starts the spawn backoff.
+FAILED_PATH = SOCKET_PATH.with_name(SOCKET_PATH.name + ".failed")
+IDLE_TIMEOUT = 15 * 60
+SPAWN_BACKOFF = 10 * 60
+
+# Environment variables, besides LRC_*, that modules read at import time.
+_FROZEN_ENV = ("HOME", "USERPROFILE", "XDG_CACHE_HOME", "XDG_CONFIG_HOME")
+_STDIO = (0, 1, 2)
+_in_server = False
+
+
+class _Shutdown(Exception):
+    pass
+
+
+def enabled() -> bool:
+    """Whether daemon dispatch is requested and supported on this platform."""
+    return (
+        not _in_server
+        and os.environ.get(ENV_FLAG) == "1"
+        and hasattr(os, "fork")
+        and hasattr(socket, "AF_UNIX")
+    )
+
+
+def _frozen_settings(env: Mapping[str, str]) -> Dict[str, str]:
+    return {
+        key: value
+        for key, value in env.items()
+        if (key.startswith("LRC_") and key != ENV_FLAG) or key in _FROZEN_ENV
+    }
+
+
+def _socket_dir_is_private() -> bool:
+    """Whether the socket directory is owned by, and only open to, this user."""
+    try:
+        info = os.lstat(SOCKET_PATH.parent)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(info.st_mode)
+        and info.st_uid == os.getuid()
+        and not info.st_mode & 0o077
+    )
+
+
+def _connect() -> Optional[Connection]:
+    # Anyone who can write the directory can plant a socket and key of
+    # their own and receive our argv, environment and stdio.
+    if not _socket_dir_is_private():
+        return None
+    try:
+        authkey = KEY_PATH.read_bytes()
+    except OSError:
+        return None
+    try:
+        return Client(str(SOCKET_PATH), family="AF_UNIX", authkey=authkey)
+    except (OSError, EOFError, AuthenticationError):
+        return None
+
+
+def dispatch(argv: List[str]) -> Optional[int]:
+    """Run *argv* on the server and return its exit code.
+
+    Returns None when no server answered or the server declined the request;
+    the caller then runs the command itself. With no server at all, one is
+    started in the background for later calls unless a recent start failed.
+    """
+    conn = _connect()
+    if conn is None:
+        if not _backing_off():
+            spawn(wait=False)
+        return None
+    umask = os.umask(0o022)
+    os.umask(umask)
+    with conn:
+        try:
+            conn.send(
+                ("run", sys.argv[0], os.getcwd(), dict(os.environ), list(argv), umask)
+            )
+            for fd in _STDIO:
+                send_handle(conn, fd, None)
+        except OSError:
+            return None
+        try:
+            reply = conn.recv()
+        except (EOFError, OSError):
+            # The request was already delivered; never run it a second time.
+            print("[ERROR] lrc daemon closed the connection", file=sys.stderr)
+            return 1
+    return None if reply is None else int(reply)
+
+
+def stop() -> bool:
+    """Ask a running server to exit; False if none was reachable."""
+    conn = _connect()
+    if conn is None:
+        return False
+    with conn:
+        conn.send(("stop",))
+        try:
+            conn.recv()
+        except (EOFError, OSError):
+            pass
+    return True
+
+
+def _backing_off() -> bool:
+    try:
+        failed_at = FAILED_PATH.stat().st_mtime
+    except OSError:
+        return False
+    return time.time() - failed_at < SPAWN_BACKOFF
+
+
+def spawn(wait: bool = True) -> bool:
+    """Start a detached server unless one is already listening.
+
+    With ``wait`` this returns once the server is accepting connections; if
+    it could not start, the reason is printed to stderr and False is
+    returned. Without ``wait`` it returns as soon as the server is forked and
+    stays silent; failures are left in ``FAILED_PATH``.
+    """
+    if _in_server or not hasattr(os, "fork"):
+        return False
+    if not wait:
+        try:
+            SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            # Nowhere to serve from (or to record the failure); never fork.
+            return False
+    sys.stdout.flush()
+    sys.stderr.flush()
+    status_r, status_w = os.pipe() if wait else (-1, -1)
+    pid = os.fork()
+    if pid:
+        # The intermediate child exits as soon as the server is forked.
+        os.waitpid(pid, 0)
+        if not wait:
+            return True
+        os.close(status_w)
+        with os.fdopen(status_r, "rb") as status_file:
+            status = status_file.read().decode("utf-8", errors="replace")
+        if status == "ok":
+            return True
+        print(
+            f"[ERROR] lrc daemon failed to start: {status or 'no status reported'}",
+            file=sys.stderr,
+        )
+        return False
+    # Double fork so the server is re-parented to init and never a zombie.
+    try:
+        if wait:
+            os.close(status_r)
+        os.setsid()
+        # Drop descriptors inherited from the caller (pipes held open by a
+        # shell or test runner) so the server never delays their EOF.
+        os.closerange(3, max(status_w, 3))
+        os.closerange(max(status_w + 1, 3), _max_fd())
+        if os.fork() == 0:
+            _serve(status_w)
+    finally:
+        os._exit(0)
+
+
+def _max_fd() -> int:
+    try:
+        return os.sysconf("SC_OPEN_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 256
+
+
+def _report(status_fd: int, message: str) -> None:
+    """Tell a waiting :func:`spawn` how start-up went, and keep a failure
+    around for clients that did not wait."""
+    try:
+        if message == "ok":
+            FAILED_PATH.unlink()
+        else:
+            # Written aside and renamed so readers never see a partial file.
+            partial = FAILED_PATH.with_name(f"{FAILED_PATH.name}.{os.getpid()}")
+            partial.write_text(message + "\n", encoding="utf-8")
+            os.replace(partial, FAILED_PATH)
+    except OSError:
+        pass
+    if status_fd < 0:
+        return
+    try:
+        os.write(status_fd, message.encode("utf-8"))
+    finally:
+        os.close(status_fd)
+
+
+def _serve(status_fd: int) -> None:
+    global _in_server
+    # Let go of the caller's stdio before the slow imports, so a client that
+    # did not wait never holds a pipe open; start-up errors are reported.
+    null = os.open(os.devnull, os.O_RDWR)
+    for fd in _STDIO:
+        os.dup2(null, fd)
+    os.close(null)
+    # Requests write through descriptors 0-2, whatever the caller had swapped in.
+    sys.stdin, sys.stdout, sys.stderr = sys.__stdin__, sys.__stdout__, sys.__stderr__
+    try:
+        SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Requests are unpickled, so only the owning user may reach the socket.
+        os.chmod(SOCKET_PATH.parent, 0o700)
+        if not _socket_dir_is_private():
+            raise PermissionError(f"{SOCKET_PATH.parent} is not private to this user")
+        running = _connect()
+        if running is not None:
+            running.close()
+            _report(status_fd, "ok")
+            return
+        for stale in (SOCKET_PATH, KEY_PATH):
+            try:
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+
+        # Pay the import cost once, up front.
+        from . import compiler, generator, integration, parser  # noqa: F401
+        from .main import main
+
+        authkey = os.urandom(32)
+        fd = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as key_file:
+            key_file.write(authkey)
+        listener = Listener(str(SOCKET_PATH), family="AF_UNIX", authkey=authkey)
+    except Exception as exc:
+        _report(status_fd, f"{type(exc).__name__}: {exc}")
+        return
+
+    _report(status_fd, "ok")
+
+    _in_server = True
+    startup = _frozen_settings(os.environ)
+
+    def _shut_down(signum: int, frame: Optional[FrameType]) -> NoReturn:
+        raise _Shutdown()
+
+    # SIGALRM is the idle timeout; SIGTERM comes from a child handling stop().
+    signal.signal(signal.SIGALRM, _shut_down)
+    signal.signal(signal.SIGTERM, _shut_down)
+    try:
+        with listener:
+            while True:
+                signal.alarm(IDLE_TIMEOUT)
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, EOFError, OSError):
+                    continue
+                finally:
+                    signal.alarm(0)
+                # The request is read in the child, so a client that connects
+                # and goes quiet never holds up the ones behind it.
+                if os.fork() == 0:
+                    # Leave the listener alone: closing it would unlink the
+                    # socket the parent still serves on.
+                    signal.signal(signal.SIGALRM, signal.SIG_DFL)
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                    os._exit(_handle(conn, startup, main))
+                conn.close()
+                _reap()
+    except _Shutdown:
+        pass
+    finally:
+        signal.alarm(0)
+        if KEY_PATH.exists() and KEY_PATH.read_bytes() == authkey:
+            KEY_PATH.unlink()
+
+
+def _reap() -> None:
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0]:
+            pass
+    except ChildProcessError:
+        pass
+
+
+def _handle(
+    conn: Connection,
+    startup: Dict[str, str],
+    main: Callable[[List[str]], int],
+) -> int:
+    code = 1
+    try:
+        request = conn.recv()
+        if request[0] == "stop":
+            server = os.getppid()
+            os.kill(server, signal.SIGTERM)
+            # Answer once the server has exited and let go of the socket, so
+            # the caller's next connection attempt cannot reach it.
+            deadline = time.monotonic() + 5
+            while os.getppid() == server and time.monotonic() < deadline:
+                time.sleep(0.01)
+            conn.send(True)
+            return 0
+        _, argv0, cwd, env, argv, umask = request
+        received = [recv_handle(conn) for _ in _STDIO]
+        if _frozen_settings(env) != startup:
+            # Module-level settings were read from the server's environment.
+            for fd in received:
+                os.close(fd)
+            conn.send(None)
+            return 0
+        for fd, handle in zip(_STDIO, received):
+            os.dup2(handle, fd)
+            os.close(handle)
+        os.chdir(cwd)
+        os.umask(umask)
+        os.environ.clear()
+        os.environ.update(env)
+        sys.argv = [argv0, *argv]
+        try:
+            code = main(argv)
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                code = exc.code or 0
+            else:
+                print(exc.code, file=sys.stderr)
+                code = 1
+        except Exception as exc:
+            print(f"[ERROR] {exc}", file=sys.stderr)
+            code = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        conn.send(code)
+    except Exception:
+        pass
+    finally:
+        conn.close()
+    return code
@@ -3,17 +3,36 @@
 from __future__ import annotations
 
 import json
+import mmap
 import os
 import shutil
+import sys
 import time
+import warnings
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from .compiler import BuildPlan, build_metadata
-from .parser import Action, is_safe_under_base
+from .parser import Action, clear_path_cache, is_safe_under_base
 
-__all__ = ["GenerationResult", "realize", "write_build_manifest"]
+if TYPE_CHECKING:
+    from . import core
+
+__all__ = [
+    "GenerationResult",
+    "expand_vars",
+    "realize",
+    "template_actions",
+    "write_build_manifest",
+]
+
+_SYMLINK_DIR_FD = os.symlink in os.supports_dir_fd
+_O_BINARY = getattr(os, "O_BINARY", 0)
+_MMAP_THRESHOLD = 1 << 20
+_PHASES = {"mkdir": 0, "write": 1, "copy": 1, "symlink": 2, "chmod": 3}
+_SUPPORTS_CHMOD = os.name != "nt"
+_FOLDS_CASE = os.name == "nt" or sys.platform == "darwin"
 
 
 @dataclass
@@ -22,116 +41,405 @@ class GenerationResult:
     created_paths: List[Path]
 
 
-def realize(
-    plan: BuildPlan,
-    output_dir: Path,
-    *,
-    dry_run: bool = False,
-    force: bool = False,
-    verbose: bool = False,
-) -> GenerationResult:
-    created: List[Path] = []
-    success = True
-
-    for action in plan.actions:
-        path = action.path
-        if not is_safe_under_base(path, output_dir):
-            print(f"[SECURITY] Skipping unsafe path: {path}")
-            success = False
-            continue
+def _is_at_or_under(path: str, roots: Iterable[str]) -> bool:
+    return any(path == root or path.startswith(root + os.sep) for root in roots)
+
 
+def _collect_directories(
+    actions: Iterable[Action], output_dir: Path
+) -> Tuple[List[Path], List[Path]]:
+    """Return the unique directories required by ``actions``, shallowest first.
+
+    Directories at or under a path that a symlink action creates come back
+    unchecked in a second list, to be made through the link once it exists.
+    """
+
+    dirs: Set[Path] = set()
+    links: List[str] = []
+    for action in actions:
         if action.kind == "mkdir":
-            if verbose or dry_run:
-                print(f"[{'DRY' if dry_run else 'mkdir'}] {path}")
-            if dry_run:
-                continue
-            path.mkdir(parents=True, exist_ok=True)
-            created.append(path)
-            continue
+            dirs.add(action.path)
+        elif action.kind in ("write", "copy", "symlink"):
+            dirs.add(action.path.parent)
+        if action.kind == "symlink":
+            links.append(action.path_str)
+    ready: List[Path] = []
+    behind_links: List[Path] = []
+    for directory in sorted(dirs, key=lambda d: len(d.parts)):
+        # Where a link points is only known once it exists, so the safety
+        # check for directories behind one is left to the caller.
+        if _is_at_or_under(os.fspath(directory), links):
+            behind_links.append(directory)
+        elif is_safe_under_base(directory, output_dir):
+            ready.append(directory)
+    return ready, behind_links
 
-        if action.kind == "write":
-            if verbose or dry_run:
-                size = len(action.content or "")
-                print(f"[{'DRY' if dry_run else 'write'}] {path} ({size} bytes)")
-            if dry_run:
-                continue
-            if path.exists() and not force:
-                print(f"[WARN] Skipping existing file (use --force to overwrite): {path}")
-                continue
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(action.content or "", encoding="utf-8")
-            created.append(path)
-            continue
 
-        if action.kind == "chmod":
-            if verbose or dry_run:
-                print(f"[{'DRY' if dry_run else 'chmod'}] {path} {oct(action.mode or 0o644)}")
-            if dry_run:
-                continue
-            if os.name != "nt":
-                try:
-                    path.chmod(action.mode or 0o644)
-                except FileNotFoundError:
-                    pass
-            continue
+def _exists(path: Path, children: Dict[Path, Set[str]]) -> bool:
+    names = children.get(path.parent)
+    if names is None:
+        return path.exists()
+    if path.name in names:
+        return True
+    # The listing is case-sensitive; confirm misses where filesystems
+    # usually fold case (README.md vs an existing readme.md).
+    return _FOLDS_CASE and path.exists()
 
-        if action.kind == "copy":
-            if verbose or dry_run:
-                print(f"[{'DRY' if dry_run else 'copy'}] {action.src} -> {path}")
-            if dry_run:
-                continue
-            if path.exists() and not force:
-                print(f"[WARN] Skipping existing file (use --force to overwrite): {path}")
-                continue
-            if not action.src or not action.src.exists():
-                print(f"[ERROR] Copy source missing: {action.src}")
-                success = False
-                continue
-            if not is_safe_under_base(action.src, action.src.parent):
-                print(f"[SECURITY] Skipping unsafe copy source: {action.src}")
-                success = False
-                continue
-            path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(action.src, path)
-            created.append(path)
-            continue
 
-        if action.kind == "symlink":
-            if verbose or dry_run:
-                print(f"[{'DRY' if dry_run else 'symlink'}] {action.target} -> {path}")
-            if dry_run:
-                continue
-            if path.exists():
-                if force:
-                    if path.is_symlink() or path.is_file():
-                        path.unlink()
-                else:
-                    print(
-                        f"[WARN] Skipping existing symlink (use --force to overwrite): {path}"
-                    )
-                    continue
-            path.parent.mkdir(parents=True, exist_ok=True)
+def _remember(path: Path, children: Dict[Path, Set[str]]) -> None:
+    names = children.get(path.parent)
+    if names is not None:
+        names.add(path.name)
+
+
+def _write_file(path: str, content: str, force: bool) -> None:
+    """Write ``content`` as UTF-8 straight to a file descriptor.
+
+    Without ``force`` the file is opened with ``O_EXCL`` so an entry that
+    appeared after the existence check raises :class:`FileExistsError`.
+    Blobs of at least ``_MMAP_THRESHOLD`` bytes are copied through a
+    shared mapping of the output file rather than ``write`` calls, falling
+    back to ``write`` when the file system refuses the mapping.
+    """
+
+    data = content.encode("utf-8")
+    use_mmap = len(data) >= _MMAP_THRESHOLD
+    # A writable shared mapping needs a descriptor opened for reading too.
+    flags = os.O_RDWR if use_mmap else os.O_WRONLY
+    flags |= os.O_CREAT | os.O_TRUNC | _O_BINARY
+    if not force:
+        flags |= os.O_EXCL
+    fd = os.open(path, flags, 0o666)
+    try:
+        if use_mmap:
+            os.ftruncate(fd, len(data))
             try:
-                path.symlink_to(action.target)
-            except OSError as exc:
-                print(f"[ERROR] Failed to create symlink {path}: {exc}")
-                success = False
+                mapped = mmap.mmap(fd, len(data), access=mmap.ACCESS_WRITE)
+            except (OSError, ValueError):
+                # The file is already sized; the writes below fill it in.
+                pass
             else:
-                created.append(path)
+                with mapped:
+                    mapped[:] = data
+                return
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _create_symlinks(links: Iterable[Action]) -> List[Tuple[Action, OSError]]:
+    """Create symlinks grouped by parent directory, returning any failures.
+
+    Where supported, each parent directory is opened once and its links are
+    created relative to that descriptor (``symlinkat``), so the kernel does
+    not walk the full path again for every link. Elsewhere each link is a
+    plain ``os.symlink`` on its full path.
+    """
+
+    groups: Dict[Path, List[Tuple[Action, str]]] = {}
+    for action in links:
+        # The parser always sets a target on symlink actions.
+        assert action.target is not None
+        groups.setdefault(action.path.parent, []).append(
+            (action, os.fspath(action.target))
+        )
+
+    failures: List[Tuple[Action, OSError]] = []
+    for parent, group in groups.items():
+        if not _SYMLINK_DIR_FD:
+            for action, target in group:
+                try:
+                    os.symlink(target, action.path_str)
+                except OSError as exc:
+                    failures.append((action, exc))
+            continue
+        try:
+            dir_fd = os.open(parent, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        except OSError as exc:
+            failures.extend((action, exc) for action, _ in group)
             continue
+        try:
+            for action, target in group:
+                try:
+                    os.symlink(target, action.path.name, dir_fd=dir_fd)
+                except OSError as exc:
+                    failures.append((action, exc))
+        finally:
+            os.close(dir_fd)
+    return failures
+
+
+def _order_actions(actions: Iterable[Action]) -> List[List[Tuple[int, Action]]]:
+    """Split actions into mkdir, write/copy, symlink and chmod phases.
+
+    Each action is paired with its schema index. Directories run shallowest
+    first and file writes are grouped by parent directory, with the index
+    breaking ties. An action at or under the path of a symlink listed before
+    it joins the symlink phase in schema order, so it goes through the link
+    instead of landing in a real directory made ahead of it.
+    """
+
+    phases: List[List[Tuple[int, Action]]] = [[], [], [], []]
+    links: List[str] = []
+    for index, action in enumerate(actions):
+        phase = _PHASES.get(action.kind, 3)
+        if phase < 2 and links and _is_at_or_under(action.path_str, links):
+            phase = 2
+        if action.kind == "symlink":
+            links.append(action.path_str)
+        phases[phase].append((index, action))
+    phases[0].sort(key=lambda item: (len(item[1].path.parts), item[0]))
+    phases[1].sort(key=lambda item: (item[1].path.parent, item[1].path.name, item[0]))
+    return phases
+
+
+class _RealizeState:
+    """Bookkeeping shared by the phases of one :func:`realize` call."""
+
+    def __init__(self, output_dir: Path, dry_run: bool, force: bool, verbose: bool):
+        self.output_dir = output_dir
+        self.dry_run = dry_run
+        self.force = force
+        self.verbose = verbose
+        self.success = True
+        self.created: List[Path] = []
+        self.made_dirs: Set[Path] = set()
+        # Known entries of each prepared directory, for _exists().
+        self.children: Dict[Path, Set[str]] = {}
+        self.pending_links: Dict[Path, Action] = {}
+        self.behind_links: List[Path] = []
+        # Verbose progress lines, tagged with the schema index of their
+        # action and printed in schema order once every phase has run.
+        self.progress: List[Tuple[int, str]] = []
+        # Nothing touches the disk on a dry run, so a lexical prefix test is
+        # enough; real builds keep the realpath-based check for symlink escapes.
+        self.base_real = os.fspath(output_dir.resolve()) if dry_run else ""
+        self.base_prefix = self.base_real.rstrip(os.sep) + os.sep
+
+    def is_safe(self, path: Path) -> bool:
+        if not self.dry_run:
+            return is_safe_under_base(path, self.output_dir)
+        candidate = os.path.normpath(os.fspath(path))
+        return candidate == self.base_real or candidate.startswith(self.base_prefix)
+
+    def report(self, index: int, message: str) -> None:
+        if self.verbose:
+            self.progress.append((index, message))
+        else:
+            print(message)
+
+    def fail(self, message: str) -> None:
+        print(message)
+        self.success = False
+
+
+def _prepare_directory(st: _RealizeState, directory: Path) -> None:
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with os.scandir(directory) as entries:
+            st.children[directory] = {entry.name for entry in entries}
+    except OSError:
+        # Reported by the action that needs the directory.
+        return
+    st.made_dirs.add(directory)
+    _remember(directory, st.children)
+
 
+def _flush_links(st: _RealizeState) -> None:
+    """Create the queued symlinks, then the directories waiting behind them."""
+
+    failed: Set[Path] = set()
+    for action, exc in _create_symlinks(st.pending_links.values()):
+        st.fail(f"[ERROR] Failed to create symlink {action.path}: {exc}")
+        failed.add(action.path)
+    for path in st.pending_links:
+        if path not in failed:
+            _remember(path, st.children)
+            st.created.append(path)
+    linked = [os.fspath(path) for path in st.pending_links if path not in failed]
+    st.pending_links.clear()
+    # New links can change where later paths resolve to.
+    clear_path_cache()
+    reachable = [d for d in st.behind_links if _is_at_or_under(os.fspath(d), linked)]
+    for directory in reachable:
+        st.behind_links.remove(directory)
+        if st.is_safe(directory):
+            _prepare_directory(st, directory)
+
+
+def _skip_existing(st: _RealizeState, path: Path) -> bool:
+    if _exists(path, st.children) and not st.force:
+        print(f"[WARN] Skipping existing file (use --force to overwrite): {path}")
+        return True
+    return False
+
+
+def _realize_mkdir(st: _RealizeState, action: Action) -> None:
+    if action.path not in st.made_dirs:
+        try:
+            os.makedirs(action.path_str, exist_ok=True)
+        except OSError as exc:
+            st.fail(f"[ERROR] Failed to create directory {action.path}: {exc}")
+            return
+    st.created.append(action.path)
+
+
+def _realize_write(st: _RealizeState, action: Action) -> None:
+    path = action.path
+    if _skip_existing(st, path):
+        return
+    try:
+        _write_file(action.path_str, action.content or "", st.force)
+    except FileExistsError:
+        print(f"[WARN] Skipping existing file (use --force to overwrite): {path}")
+        return
+    except OSError as exc:
+        st.fail(f"[ERROR] Failed to write {path}: {exc}")
+        return
+    _remember(path, st.children)
+    st.created.append(path)
+
+
+def _realize_chmod(st: _RealizeState, action: Action) -> None:
+    if _SUPPORTS_CHMOD:
+        try:
+            os.chmod(action.path_str, action.mode or 0o644)
+        except FileNotFoundError:
+            pass
+
+
+def _realize_copy(st: _RealizeState, action: Action) -> None:
+    path = action.path
+    if _skip_existing(st, path):
+        return
+    if not action.src or not action.src.exists():
+        st.fail(f"[ERROR] Copy source missing: {action.src}")
+        return
+    if not is_safe_under_base(action.src, action.src.parent):
+        st.fail(f"[SECURITY] Skipping unsafe copy source: {action.src}")
+        return
+    try:
+        shutil.copy2(action.src, action.path_str)
+    except OSError as exc:
+        st.fail(f"[ERROR] Failed to copy {action.src} -> {path}: {exc}")
+        return
+    _remember(path, st.children)
+    st.created.append(path)
+
+
+def _realize_symlink(st: _RealizeState, action: Action) -> None:
+    # Queued here and created in a batch by _flush_links().
+    path = action.path
+    if path in st.pending_links or _exists(path, st.children):
+        if not st.force:
+            print(
+                f"[WARN] Skipping existing symlink (use --force to overwrite): {path}"
+            )
+            return
+        if path in st.pending_links:
+            del st.pending_links[path]
+        elif path.is_symlink() or path.is_file():
+            path.unlink()
+    st.pending_links[path] = action
+
+
+_ACTION_HANDLERS: Dict[str, Callable[[_RealizeState, Action], None]] = {
+    "mkdir": _realize_mkdir,
+    "write": _realize_write,
+    "chmod": _realize_chmod,
+    "copy": _realize_copy,
+    "symlink": _realize_symlink,
+}
+
+
+def _describe(action: Action) -> str:
+    if action.kind == "write":
+        return f"{action.path} ({len(action.content or '')} bytes)"
+    if action.kind == "chmod":
+        return f"{action.path} {oct(action.mode or 0o644)}"
+    if action.kind == "copy":
+        return f"{action.src} -> {action.path}"
+    if action.kind == "symlink":
+        return f"{action.target} -> {action.path}"
+    return str(action.path)
+
+
+def _realize_action(st: _RealizeState, index: int, action: Action) -> None:
+    path = action.path
+    if not st.is_safe(path):
+        st.fail(f"[SECURITY] Skipping unsafe path: {path}")
+        return
+    if st.pending_links and (
+        action.kind != "symlink"
+        or _is_at_or_under(
+            os.fspath(path.parent),
+            (link.path_str for link in st.pending_links.values()),
+        )
+    ):
+        # Only actions behind an earlier link share its phase, so the links
+        # must exist before they run.
+        _flush_links(st)
+    handler = _ACTION_HANDLERS.get(action.kind)
+    if handler is None:
         print(f"[WARN] Unknown action kind: {action.kind}")
+        return
+    if st.verbose or st.dry_run:
+        st.report(
+            index, f"[{'DRY' if st.dry_run else action.kind}] {_describe(action)}"
+        )
+    if not st.dry_run:
+        handler(st, action)
 
-    return GenerationResult(success=success, created_paths=created)
+
+def realize(
+    plan: BuildPlan,
+    output_dir: Path,
+    *,
+    dry_run: bool = False,
+    force: bool = False,
+    verbose: bool = False,
+) -> GenerationResult:
+    """Apply ``plan`` under ``output_dir``.
+
+    Errors and warnings are printed as they happen. In verbose mode the
+    per-action progress lines are held back and printed in schema order
+    at the end, since the phases run actions out of order.
+    """
+
+    st = _RealizeState(output_dir, dry_run, force, verbose)
+    clear_path_cache()
+    if not dry_run:
+        ready, st.behind_links = _collect_directories(plan.actions, output_dir)
+        for directory in ready:
+            _prepare_directory(st, directory)
+
+    # A dry run executes nothing, so it simply reports in schema order.
+    phases = (
+        [list(enumerate(plan.actions))] if dry_run else _order_actions(plan.actions)
+    )
+    try:
+        for phase in phases:
+            for index, action in phase:
+                _realize_action(st, index, action)
+            if st.pending_links:
+                _flush_links(st)
+    finally:
+        for _, message in sorted(st.progress, key=lambda entry: entry[0]):
+            print(message)
+
+    return GenerationResult(success=st.success, created_paths=st.created)
 
 
 def write_build_manifest(
     plan: BuildPlan,
     output_dir: Path,
     *,
-    dry_run: bool,
+    dry_run: bool = False,
     audit_summary: Optional[Dict[str, object]] = None,
 ) -> Optional[Path]:
+    # Callers skip the call on dry runs; ``dry_run`` stays for compatibility.
     if dry_run:
         return None
     manifest_path = output_dir / ".lrc-build.json"
@@ -144,5 +452,40 @@ def write_build_manifest(
     )
     if audit_summary is not None:
         manifest["audit"] = audit_summary
-    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    manifest_path.write_text(
+        json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8"
+    )
     return manifest_path
+
+
+# ---------------------------------------------------------------------------
+# Deprecated helpers kept from the former ``lrc.generator`` package, which
+# delegated to ``lrc.core``.
+
+
+def template_actions(
+    name: str, root: Path, vars_: Dict[str, str]
+) -> List["core.Action"]:
+    """Deprecated: use ``lrc.core.template_actions``."""
+
+    warnings.warn(
+        "lrc.generator.template_actions is deprecated; use lrc.core.template_actions",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    from .core import template_actions as _template_actions
+
+    return _template_actions(name, root, vars_)
+
+
+def expand_vars(value: str, vars_: Dict[str, str]) -> str:
+    """Deprecated: use ``lrc.parser.expand_vars``."""
+
+    warnings.warn(
+        "lrc.generator.expand_vars is deprecated; use lrc.parser.expand_vars",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    from .core import expand_vars as _expand_vars
+
+    return _expand_vars(value, vars_)
@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import copy
+import functools
 import json
 import os
+import selectors
 import shlex
 import subprocess
 import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 from .compiler import BuildPlan
 
@@ -24,16 +27,100 @@ DEFAULT_CONFIG = {
     "gpg": {"enable_signing": True, "signing_key": ""},
 }
 
+_READ_CHUNK = 64 << 10
+# Upper bound on the bytes kept per stream for the audit summary; anything
+# beyond it is still drained from the pipe (so dat never blocks) but dropped.
+_MAX_CAPTURE = 1 << 20
+
+_config_announced = False
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dat_config() -> Tuple[Dict[str, object], bool]:
+    """Read (or create) the integration config once per process."""
 
-def ensure_dat_config(verbose: bool = False) -> Dict[str, object]:
     if CONFIG_PATH.exists():
-        return json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+        return json.loads(CONFIG_PATH.read_text(encoding="utf-8")), False
 
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
     CONFIG_PATH.write_text(json.dumps(DEFAULT_CONFIG, indent=2), encoding="utf-8")
-    if verbose:
+    return copy.deepcopy(DEFAULT_CONFIG), True
+
+
+def ensure_dat_config(verbose: bool = False) -> Dict[str, object]:
+    global _config_announced
+    config, created = _load_dat_config()
+    if created and verbose and not _config_announced:
+        _config_announced = True
         print(f"[audit] created integration config at {CONFIG_PATH}")
-    return DEFAULT_CONFIG.copy()
+    return copy.deepcopy(config)
+
+
+def _capture_output(command: List[str]) -> Tuple[int, bytes, bytes]:
+    """Run ``command`` and drain stdout/stderr incrementally as raw bytes.
+
+    At most ``_MAX_CAPTURE`` bytes of each stream are kept.
+    """
+
+    if os.name == "nt":
+        # Selectors cannot poll pipes on Windows; fall back to blocking capture.
+        result = subprocess.run(command, capture_output=True, check=False)
+        return (
+            result.returncode,
+            _clip(result.stdout, len(result.stdout)),
+            _clip(result.stderr, len(result.stderr)),
+        )
+
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert proc.stdout is not None and proc.stderr is not None
+    out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+    buffers = {out_fd: bytearray(), err_fd: bytearray()}
+    totals = {out_fd: 0, err_fd: 0}
+    chunk = bytearray(_READ_CHUNK)
+    view = memoryview(chunk)
+
+    try:
+        with selectors.DefaultSelector() as selector:
+            for fd in buffers:
+                os.set_blocking(fd, False)
+                selector.register(fd, selectors.EVENT_READ)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    try:
+                        count = os.readv(key.fd, [chunk])
+                    except BlockingIOError:
+                        continue
+                    if not count:
+                        selector.unregister(key.fd)
+                        continue
+                    totals[key.fd] += count
+                    buf = buffers[key.fd]
+                    room = _MAX_CAPTURE - len(buf)
+                    if room > 0:
+                        buf += view[: min(count, room)]
+    except BaseException:
+        # Interrupted or failed mid-drain: never leave dat running behind us.
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+    return (
+        proc.wait(),
+        _clip(buffers[out_fd], totals[out_fd]),
+        _clip(buffers[err_fd], totals[err_fd]),
+    )
+
+
+def _clip(data: Union[bytes, bytearray], total: int) -> bytes:
+    """First ``_MAX_CAPTURE`` bytes of a stream of *total* bytes, marked if cut."""
+
+    if total <= _MAX_CAPTURE:
+        return bytes(data)
+    return bytes(data[:_MAX_CAPTURE]) + b"\n[... %d bytes truncated]" % (
+        total - _MAX_CAPTURE
+    )
 
 
 def run_dat_audit(
@@ -61,15 +148,9 @@ def run_dat_audit(
     stderr = ""
 
     try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        exit_code = result.returncode
-        stdout = result.stdout.strip()
-        stderr = result.stderr.strip()
+        exit_code, out_bytes, err_bytes = _capture_output(command)
+        stdout = out_bytes.decode("utf-8", errors="replace").strip()
+        stderr = err_bytes.decode("utf-8", errors="replace").strip()
     except FileNotFoundError:
         mocked = True
         exit_code = 127
@@ -92,8 +173,10 @@ def run_dat_audit(
         "project": plan.project_name,
     }
 
+    summary_bytes = json.dumps(summary, indent=2, sort_keys=True).encode("utf-8")
+
     audit_path = output_dir / ".lrc-audit.json"
-    audit_path.write_text(json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8")
+    audit_path.write_bytes(summary_bytes)
 
     if audit_format in {"pdf", "combined"}:
         pdf_path = output_dir / "audit.pdf"
@@ -108,7 +191,7 @@ def run_dat_audit(
     if audit_out:
         audit_out.parent.mkdir(parents=True, exist_ok=True)
         if audit_format == "json":
-            audit_out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+            audit_out.write_bytes(summary_bytes)
         elif audit_format == "pdf":
             audit_out.write_text("DAT audit placeholder PDF", encoding="utf-8")
         elif audit_format == "md":
@@ -117,7 +200,7 @@ def run_dat_audit(
             base = audit_out
             audit_out_json = base.with_suffix(".json")
             audit_out_pdf = base.with_suffix(".pdf")
-            audit_out_json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+            audit_out_json.write_bytes(summary_bytes)
             audit_out_pdf.write_text("DAT audit placeholder PDF", encoding="utf-8")
 
     if verbose:
@@ -4,24 +4,57 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import os
 import sys
 from pathlib import Path
 from typing import Optional
 
 from . import __version__
-from .bootstrap import do_bootstrap
-from .compiler import (
-    check_fs_ok, 
-    compile_schema_path, 
-    print_platform_info, 
-    resolve_output_directory
+
+_VERSION_STRING = f"lrc {__version__}"
+_AUDIT_FORMATS = ("json", "pdf", "md", "combined")
+# Defaults for the audit destinations, shared by the core parser and the
+# bare-invocation fast path so both produce identical namespaces.
+_AUDIT_DEFAULTS = {
+    "audit": False,
+    "audit_out": None,
+    "audit_format": "json",
+    "audit_args": "",
+}
+_SCHEMA_REQUIRED = "a schema path is required unless using --platform-info or --bootstrap"
+# What _core_parser().error(_SCHEMA_REQUIRED) prints for a bare ``lrc`` in an
+# 80-column terminal; tests/test_cli.py keeps the two in sync.
+_SHORT_USAGE = (
+    "usage: lrc [-h] [--version] [--bootstrap] [--platform-info] [--daemon]\n"
+    "           [-o OUT] [-n] [-f] [-v]\n"
+    "           [schema]\n"
+    f"lrc: error: {_SCHEMA_REQUIRED}\n"
 )
-from .generator import realize, write_build_manifest
-from .integration import run_dat_audit
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Build the command line argument parser for LRC."""
+def _report_error(
+    prefix: str,
+    exc: BaseException,
+    verbose: bool,
+    exit_code: int = 1,
+    level: str = "ERROR",
+) -> int:
+    """Print a ``[LEVEL] prefix: exc`` line (plus traceback when verbose)."""
+    print(f"[{level}] {prefix}: {exc}", file=sys.stderr)
+    if verbose:
+        import traceback
+
+        traceback.print_exc()
+    return exit_code
+
+
+def _build_core_parser() -> argparse.ArgumentParser:
+    """Build the parser for every option except the audit group.
+
+    The audit destinations get their defaults via ``set_defaults`` so a
+    namespace from this parser has the same attributes as a full one.
+    """
     parser = argparse.ArgumentParser(
         prog="lrc",
         description="Local Repo Compiler — Build repositories from declarative schemas",
@@ -47,7 +80,7 @@ Examples:
     parser.add_argument(
         "--version", 
         action="version", 
-        version=f"lrc {__version__}"
+        version=_VERSION_STRING
     )
     parser.add_argument(
         "--bootstrap", 
@@ -59,6 +92,11 @@ Examples:
         action="store_true",
         help="Print detected platform information and exit"
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Start the background server used when LRC_DAEMON=1 and exit"
+    )
     
     # Generation options
     parser.add_argument(
@@ -81,7 +119,15 @@ Examples:
         action="store_true", 
         help="Enable verbose logging"
     )
-    
+    parser.set_defaults(**_AUDIT_DEFAULTS)
+
+    return parser
+
+
+def _attach_audit_group(
+    parser: argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    """Add the audit options (and the hidden backcompat alias) to *parser*."""
     # Audit integration
     audit_group = parser.add_argument_group('audit options')
     audit_group.add_argument(
@@ -96,7 +142,7 @@ Examples:
     )
     audit_group.add_argument(
         "--audit-format",
-        choices=["json", "pdf", "md", "combined"],
+        choices=_AUDIT_FORMATS,
         default="json",
         help="Audit artifact format (default: %(default)s)"
     )
@@ -110,13 +156,49 @@ Examples:
     parser.add_argument(
         "--audit-out-format",
         dest="audit_format",
-        choices=["json", "pdf", "md", "combined"],
+        choices=_AUDIT_FORMATS,
         help=argparse.SUPPRESS,  # Hidden for backwards compatibility
     )
     
     return parser
 
 
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the full command line argument parser for LRC.
+
+    The parser is static, so it is built once per process and shared;
+    ``parse_args`` fills a fresh namespace without mutating it.
+    """
+    return _attach_audit_group(_build_core_parser())
+
+
+@functools.lru_cache(maxsize=1)
+def _core_parser() -> argparse.ArgumentParser:
+    """Cached parser without the audit group, for argv that never uses it."""
+    return _build_core_parser()
+
+
+def _select_parser(argv: list[str]) -> argparse.ArgumentParser:
+    """
+    Pick the parser for *argv*.
+    
+    Args:
+        argv: Command line arguments
+        
+    Returns:
+        The full parser for help or audit invocations, else the core parser
+    """
+    # Prefixes rather than exact flags so argparse abbreviations ("--aud",
+    # "--he") and short-flag clusters ("-vh") still get the full parser.
+    for a in argv:
+        if a.startswith(("--au", "--h")):
+            return build_parser()
+        if a.startswith("-") and not a.startswith("--") and "h" in a:
+            return build_parser()
+    return _core_parser()
+
+
 def validate_args(args: argparse.Namespace) -> tuple[bool, str]:
     """
     Validate command line arguments.
@@ -127,14 +209,6 @@ def validate_args(args: argparse.Namespace) -> tuple[bool, str]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    # Check for conflicting audit format arguments
-    if hasattr(args, 'audit_out_format') and args.audit_out_format:
-        args.audit_format = args.audit_out_format
-    
-    # Validate schema file exists when required
-    if args.schema and not Path(args.schema).exists():
-        return False, f"schema file not found: {args.schema}"
-    
     # Validate output directory permissions
     if args.out and args.out.exists() and not args.out.is_dir():
         return False, f"output path exists but is not a directory: {args.out}"
@@ -142,6 +216,31 @@ def validate_args(args: argparse.Namespace) -> tuple[bool, str]:
     return True, ""
 
 
+def _fast_parse(argv: list[str]) -> Optional[argparse.Namespace]:
+    """
+    Parse the bare ``lrc <schema>`` invocation without building argparse.
+    
+    Args:
+        argv: Command line arguments
+        
+    Returns:
+        Namespace with the parser defaults, or None if argparse is needed
+    """
+    if len(argv) != 1 or not argv[0] or argv[0].startswith("-"):
+        return None
+    return argparse.Namespace(
+        schema=argv[0],
+        bootstrap=False,
+        platform_info=False,
+        daemon=False,
+        out=None,
+        dry_run=False,
+        force=False,
+        verbose=False,
+        **_AUDIT_DEFAULTS,
+    )
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     """
     Main entry point for LRC CLI.
@@ -152,17 +251,63 @@ def main(argv: Optional[list[str]] = None) -> int:
     Returns:
         Exit code (0 for success, non-zero for errors)
     """
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    # Fast paths for the most common invocations; anything else goes
+    # through the full argparse parser.
+    if not argv:
+        sys.stderr.write(_SHORT_USAGE)
+        return 2
+    if argv == ["--version"]:
+        print(_VERSION_STRING)
+        return 0
+
+    # "--da" also catches argparse abbreviations of --daemon, which must
+    # start a server here rather than be forwarded to a running one.
+    if os.environ.get("LRC_DAEMON") == "1" and not any(
+        a.startswith("--da") for a in argv
+    ):
+        from . import daemon
+
+        if daemon.enabled():
+            code = daemon.dispatch(argv)
+            if code is not None:
+                return code
+
+    # The fast path never builds argparse; error paths below build (and
+    # cache) the parser only when they need its usage text.
+    args = _fast_parse(argv)
+    if args is None:
+        args = _select_parser(argv).parse_args(argv)
+
+    verbose = args.verbose
+    dry_run = args.dry_run
+    force = args.force
+    schema = args.schema
+    audit = args.audit
     
-    # Handle information commands first
+    # Handle information commands first; heavy modules are imported only
+    # on the code path that needs them to keep CLI start-up cheap.
     if args.platform_info:
-        print_platform_info(verbose=args.verbose)
+        from .compiler import print_platform_info
+
+        print_platform_info(verbose=verbose)
+        return 0
+
+    if args.daemon:
+        from .daemon import SOCKET_PATH, spawn
+
+        if not spawn():
+            return 1
+        if verbose:
+            print(f"[INFO] lrc daemon listening on {SOCKET_PATH}")
         return 0
 
     if args.bootstrap:
+        from .bootstrap import do_bootstrap
+
         try:
-            target = do_bootstrap(sys.argv[0], verbose=args.verbose)
+            target = do_bootstrap(sys.argv[0], verbose=verbose)
             print(f"✓ Installed LRC to {target}")
             return 0
         except Exception as e:
@@ -172,30 +317,26 @@ def main(argv: Optional[list[str]] = None) -> int:
     # Validate arguments
     is_valid, error_msg = validate_args(args)
     if not is_valid:
-        parser.error(error_msg)
+        _select_parser(argv).error(error_msg)
 
     # Schema is required for generation commands
-    if not args.schema:
-        parser.error("a schema path is required unless using --platform-info or --bootstrap")
+    if not schema:
+        _select_parser(argv).error(_SCHEMA_REQUIRED)
+
+    from .compiler import check_fs_ok, compile_schema_path, resolve_output_directory
 
-    schema_path = Path(args.schema)
+    schema_path = Path(schema)
     output_hint = args.out
 
+    cwd_fallback = output_hint if output_hint is not None else Path(os.getcwd())
+
     try:
         # Compile schema into execution plan
-        plan = compile_schema_path(
-            schema_path, 
-            output_hint or Path.cwd(), 
-            verbose=args.verbose
-        )
+        plan = compile_schema_path(schema_path, cwd_fallback, verbose=verbose)
     except FileNotFoundError:
-        parser.error(f"schema file not found: {schema_path}")
+        _select_parser(argv).error(f"schema file not found: {schema_path}")
     except Exception as exc:
-        print(f"[ERROR] Failed to compile schema: {exc}", file=sys.stderr)
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        return 1
+        return _report_error("Failed to compile schema", exc, verbose, 1)
 
     # Resolve output directory
     try:
@@ -203,8 +344,9 @@ def main(argv: Optional[list[str]] = None) -> int:
         if output_dir != plan.root:
             plan = plan.rebase(output_dir)
     except Exception as exc:
-        print(f"[ERROR] Failed to resolve output directory: {exc}", file=sys.stderr)
-        return 2
+        return _report_error(
+            "Failed to resolve output directory", exc, verbose, 2
+        )
 
     # Check filesystem permissions
     ok, reason = check_fs_ok(output_dir)
@@ -212,30 +354,32 @@ def main(argv: Optional[list[str]] = None) -> int:
         print(f"[ERROR] Output directory not writable: {reason}", file=sys.stderr)
         return 3
 
-    if args.verbose:
-        print(f"[PLAN] Generating project to: {output_dir}")
-        print(f"[PLAN] Total operations: {len(plan.operations)}")
+    if verbose:
+        sys.stdout.write(
+            f"[PLAN] Generating project to: {output_dir}\n"
+            f"[PLAN] Total operations: {len(plan.actions)}\n"
+        )
+
+    from .generator import realize, write_build_manifest
 
     # Execute generation plan
     try:
         result = realize(
             plan, 
             output_dir, 
-            dry_run=args.dry_run, 
-            force=args.force, 
-            verbose=args.verbose
+            dry_run=dry_run, 
+            force=force, 
+            verbose=verbose
         )
     except Exception as exc:
-        print(f"[ERROR] Generation failed: {exc}", file=sys.stderr)
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        return 4
+        return _report_error("Generation failed", exc, verbose, 4)
 
     # Run DAT audit if requested
     audit_summary = None
-    if args.audit and not args.dry_run:
-        if args.verbose:
+    if audit and not dry_run:
+        from .integration import run_dat_audit
+
+        if verbose:
             print("[AUDIT] Running security audit...")
         
         try:
@@ -245,37 +389,32 @@ def main(argv: Optional[list[str]] = None) -> int:
                 audit_out=args.audit_out,
                 audit_format=args.audit_format,
                 audit_args=args.audit_args,
-                verbose=args.verbose,
+                verbose=verbose,
             )
             
-            if args.verbose and audit_summary:
+            if verbose and audit_summary:
                 print(f"[AUDIT] Completed with {audit_summary.get('violations', 0)} violations")
                 
         except Exception as exc:
-            print(f"[WARNING] Audit failed: {exc}", file=sys.stderr)
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
+            _report_error("Audit failed", exc, verbose, level="WARNING")
 
-    # Write build manifest
-    try:
-        manifest_path = write_build_manifest(
-            plan, 
-            output_dir, 
-            dry_run=args.dry_run, 
-            audit_summary=audit_summary
-        )
-        
-        if args.verbose and manifest_path:
-            print(f"[INFO] Build manifest written to: {manifest_path}")
-            
-    except Exception as exc:
-        print(f"[WARNING] Failed to write build manifest: {exc}", file=sys.stderr)
+    # Write build manifest (nothing to record on a dry run)
+    if not dry_run:
+        try:
+            manifest_path = write_build_manifest(
+                plan, output_dir, audit_summary=audit_summary
+            )
+            if verbose:
+                print(f"[INFO] Build manifest written to: {manifest_path}")
+        except Exception as exc:
+            _report_error(
+                "Failed to write build manifest", exc, verbose, level="WARNING"
+            )
 
     # Report results
-    if args.verbose:
+    if verbose:
         if result.success:
-            if args.dry_run:
+            if dry_run:
                 print("✓ Dry run completed successfully")
             else:
                 print("✓ Project generation completed successfully")
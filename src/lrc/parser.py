@@ -10,13 +10,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 import fnmatch
+import functools
+import hashlib
 import json
 import os
 from pathlib import Path
 import re
 import shutil
 import subprocess
-from typing import Dict, Iterable, List, Literal, Optional, Tuple
+import time
+import warnings
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union, cast
 
 try:
     from importlib import resources as importlib_resources
@@ -29,6 +33,8 @@ __all__ = [
     "GPGReport",
     "ParseError",
     "ParserResult",
+    "ParserState",
+    "clear_path_cache",
     "coalesce_mkdirs",
     "detect_signature_file",
     "expand_vars",
@@ -53,6 +59,35 @@ REQUIRE_SIGNED_IMPORTS = (
     os.environ.get("LRC_REQUIRE_SIGNED_INCLUDES", "").lower() in {"1", "true", "yes"}
 )
 
+# Opt-in: parsed includes are written under the user's cache directory.
+INCLUDE_CACHE_ENABLED = (
+    os.environ.get("LRC_INCLUDE_CACHE", "").lower() in {"1", "true", "yes"}
+)
+INCLUDE_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "lrc"
+    / "include-parse"
+)
+# Bump when the cache entry layout or the parser's output changes.
+_INCLUDE_CACHE_FORMAT = 3
+# Entries unused for this long are pruned, and the oldest entries go first
+# once the directory grows past the size bound.
+_INCLUDE_CACHE_MAX_AGE = 30 * 24 * 3600
+_INCLUDE_CACHE_MAX_BYTES = 64 << 20
+
+_EXEC_SUFFIXES = frozenset({".sh", ".py", ".pl", ".rb"})
+# Packaged templates only mark shell and Python files executable.
+_TEMPLATE_EXEC_SUFFIXES = frozenset({".sh", ".py"})
+_META_KEYS = {"project": "Project", "description": "Description", "version": "Version"}
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+_VAR_RE = re.compile(r"\$\{([^}]+)\}")
+# Exported public key(s) for in-process verification with the optional
+# ``pgpy`` package; when unset (or pgpy is missing) gpg is used instead.
+GPG_KEYRING_ENV = "LRC_GPG_KEYRING"
+# Upper bound on concurrent ``gpg --verify`` processes when draining the
+# pending include signatures.
+_GPG_PARALLEL = os.cpu_count() or 4
+
 
 @dataclass
 class Action:
@@ -64,6 +99,11 @@ class Action:
     mode: Optional[int] = None
     src: Optional[Path] = None
     target: Optional[Path] = None
+    path_str: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Cached string form of ``path`` for the os.* calls in realize().
+        self.path_str = os.fspath(self.path)
 
 
 @dataclass
@@ -86,6 +126,15 @@ class ParserResult:
     ignores: List[str]
     gpg_reports: List[GPGReport] = field(default_factory=list)
 
+    def __iter__(self) -> Iterator[object]:
+        # lrc.parser.parse_schema used to return (actions, metadata, variables).
+        warnings.warn(
+            "unpacking ParserResult is deprecated; use its attributes instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return iter((self.actions, self.metadata, self.variables))
+
 
 @dataclass
 class ParseError(Exception):
@@ -101,12 +150,27 @@ class ParseError(Exception):
         return f"Line {self.line_num}: {self.message}"
 
 
+# (include_path, signature, line_num, line, report) awaiting ``gpg --verify``
+_PendingSignature = Tuple[Path, Path, int, str, GPGReport]
+# (include_path, line_num, line, sha256, base_dir, leaf) for every @include, in
+# parse order; base_dir and leaf are what include_path was resolved from
+_IncludeRecord = Tuple[Path, int, str, str, str, str]
+# (cache_key, result, include_records, copy_sources) held back until the
+# include tree's signatures have been verified
+_PendingCacheStore = Tuple[str, "ParserResult", List[_IncludeRecord], List[Path]]
+# (rest, line, state, base_dir, line_num, verbose) for each ``@name`` handler
+_DirectiveHandler = Callable[[str, str, "ParserState", Path, int, bool], None]
+
+
 class ParserState:
     """Internal mutable state used while parsing a schema."""
 
-    def __init__(self, out_root: Path):
+    def __init__(self, out_root: Path, parent: Optional["ParserState"] = None):
         self.out_root = out_root
-        self.dir_stack: List[Path] = [out_root]
+        # Directories are kept as plain strings and joined with os.path.join;
+        # a Path is only built for each Action.
+        self.out_root_str = os.fspath(out_root)
+        self.dir_stack: List[str] = [self.out_root_str]
         self.indent_stack: List[int] = [0]
         self.actions: List[Action] = []
         self.meta: Dict[str, Optional[str]] = {
@@ -125,11 +189,78 @@ class ParserState:
         self.heredoc_stack: List[Tuple[str, Path, int]] = []  # (marker, path, start_index)
         self.trusted_templates: Optional[set[str]] = None
         self.base_dir: Path = out_root
+        # Resolved once per schema for the @include/@copy containment checks.
+        self.base_real: str = ""
+        self.out_real: str = ""
         self.gpg_reports: List[GPGReport] = []
-
-    def current_dir(self) -> Path:
+        # Shared by every schema in one include tree, so an include only
+        # borrows its parent's containers: pending signatures are drained by
+        # the root, records and copy sources feed the include parse cache,
+        # and the stat/listing/Path caches assume the filesystem does not
+        # change during one parse.
+        self.pending_signatures: List[_PendingSignature]
+        self.include_records: List[_IncludeRecord]
+        self.copy_sources: List[Path]
+        self.pending_cache_stores: List[_PendingCacheStore]
+        self.stat_cache: Dict[str, Optional[os.stat_result]]
+        self.dir_entries: Dict[str, Dict[str, os.DirEntry[str]]]
+        # One Path per directory string, reused when a section is re-entered.
+        self.dir_paths: Dict[str, Path]
+        if parent is None:
+            self.pending_signatures = []
+            self.include_records = []
+            self.copy_sources = []
+            self.pending_cache_stores = []
+            self.stat_cache = {}
+            self.dir_entries = {}
+            self.dir_paths = {}
+        else:
+            self.pending_signatures = parent.pending_signatures
+            self.include_records = parent.include_records
+            self.copy_sources = parent.copy_sources
+            self.pending_cache_stores = parent.pending_cache_stores
+            self.stat_cache = parent.stat_cache
+            self.dir_entries = parent.dir_entries
+            self.dir_paths = parent.dir_paths
+
+    def current_dir(self) -> str:
         return self.dir_stack[-1]
 
+    def stat(self, path: Path) -> Optional[os.stat_result]:
+        key = os.fspath(path)
+        try:
+            return self.stat_cache[key]
+        except KeyError:
+            pass
+        try:
+            result: Optional[os.stat_result] = os.stat(key)
+        except (OSError, ValueError):
+            result = None
+        self.stat_cache[key] = result
+        return result
+
+    def dir_path(self, path_str: str) -> Path:
+        path = self.dir_paths.get(path_str)
+        if path is None:
+            path = self.dir_paths[path_str] = Path(path_str)
+        return path
+
+    def exists(self, path: Path) -> bool:
+        return self.stat(path) is not None
+
+    def entries(self, directory: Path) -> Dict[str, os.DirEntry[str]]:
+        """Name -> DirEntry map for *directory*, from one ``os.scandir``."""
+        key = os.fspath(directory)
+        found = self.dir_entries.get(key)
+        if found is None:
+            try:
+                with os.scandir(key) as it:
+                    found = {entry.name: entry for entry in it}
+            except OSError:
+                found = {}
+            self.dir_entries[key] = found
+        return found
+
 
 # ---------------------------------------------------------------------------
 # Utility helpers
@@ -152,16 +283,25 @@ def normalize_line_endings(content: str, target: Optional[str] = None) -> str:
 
 
 def expand_vars(value: str, vars_: Dict[str, str]) -> str:
-    if not value:
+    # Most tokens reference no variables; skip the regex engine for them.
+    if not value or "${" not in value:
         return value
+    return _VAR_RE.sub(lambda m: vars_.get(m.group(1), m.group(0)), value)
 
-    pattern = re.compile(r"\$\{([^}]+)\}")
 
-    def repl(match: re.Match[str]) -> str:
-        key = match.group(1)
-        return vars_.get(key, match.group(0))
-
-    return pattern.sub(repl, value)
+def _maybe_chmod_exec(
+    actions: List[Action],
+    target_path: Path,
+    suffixes: frozenset[str] = _EXEC_SUFFIXES,
+) -> None:
+    """Queue a 0o755 chmod for *target_path* if its suffix is a script type."""
+    if IS_WINDOWS:
+        return
+    name = target_path.name
+    dot = name.rfind(".")
+    # dot > 0 mirrors Path.suffix: a leading-dot name like ".py" has none.
+    if dot > 0 and name[dot:] in suffixes:
+        actions.append(Action("chmod", target_path, mode=0o755))
 
 
 def validate_file_extension(filename: str) -> bool:
@@ -182,16 +322,60 @@ def validate_file_extension(filename: str) -> bool:
     return ext not in dangerous
 
 
-def is_safe_under_base(path: Path, base_dir: Path) -> bool:
+@functools.lru_cache(maxsize=4096)
+def _resolved(path_str: str) -> str:
+    try:
+        return os.path.normcase(os.path.realpath(path_str))
+    except (OSError, ValueError):  # pragma: no cover - fallback path handling
+        return os.path.normcase(os.path.abspath(path_str))
+
+
+def clear_path_cache() -> None:
+    """Forget memoized path resolutions (call when the filesystem changes)."""
+
+    _resolved.cache_clear()
+
+
+def is_safe_under_base(
+    path: Path, base_dir: Path, base_real: Optional[str] = None
+) -> bool:
+    """Whether *path* resolves inside *base_dir*.
+
+    ``base_real`` may carry an already resolved ``base_dir`` (see
+    ``ParserState.base_real``) to skip resolving it again.
+    """
+
     try:
-        base_real = os.path.realpath(str(get_safe_path(base_dir)))
-        target_real = os.path.realpath(str(get_safe_path(path)))
-        return os.path.commonpath([base_real, target_real]) == base_real
+        if base_real is None:
+            base_real = _resolved(str(base_dir))
+        target_real = _resolved(str(path))
     except (ValueError, OSError):
         return False
+    return _is_within(target_real, base_real)
+
+
+def _is_within(target_real: str, base_real: str) -> bool:
+    return target_real == base_real or target_real.startswith(
+        base_real.rstrip(os.sep) + os.sep
+    )
+
+
+def _resolve_under(parent: Path, leaf: str, base_real: str) -> Optional[Path]:
+    """Resolve ``parent/leaf`` once; None when it escapes *base_real*."""
+
+    real = os.path.realpath(os.path.join(parent, leaf))
+    if not _is_within(os.path.normcase(real), base_real):
+        return None
+    return Path(real)
 
 
 def load_trusted_templates(base_dir: Path) -> set[str]:
+    return set(_load_trusted_templates_cached(str(get_safe_path(Path(base_dir)))))
+
+
+@functools.lru_cache(maxsize=64)
+def _load_trusted_templates_cached(base_dir_str: str) -> frozenset[str]:
+    base_dir = Path(base_dir_str)
     candidates = [
         base_dir / "trusted_templates.json",
         base_dir / ".lrc" / "trusted_templates.json",
@@ -205,24 +389,32 @@ def load_trusted_templates(base_dir: Path) -> set[str]:
             except json.JSONDecodeError as exc:
                 raise ParseError(0, f"Invalid trusted template policy: {candidate}", str(exc))
             if isinstance(data, list):
-                return {str(item).strip() for item in data if str(item).strip()}
-    return set(DEFAULT_TRUSTED_TEMPLATES)
+                return frozenset(str(item).strip() for item in data if str(item).strip())
+    return frozenset(DEFAULT_TRUSTED_TEMPLATES)
 
 
 # ---------------------------------------------------------------------------
 # Signature validation helpers
 
 
-def detect_signature_file(schema_path: Path) -> Optional[Path]:
-    candidates = [
-        schema_path.with_name(schema_path.name + ".asc"),
-        schema_path.with_name(schema_path.name + ".sig"),
-        schema_path.with_suffix(schema_path.suffix + ".asc"),
-        schema_path.with_suffix(schema_path.suffix + ".sig"),
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return candidate
+def detect_signature_file(
+    schema_path: Path,
+    entries: Optional[Dict[str, os.DirEntry[str]]] = None,
+) -> Optional[Path]:
+    # ``with_suffix(suffix + ".asc")`` always names the same file as
+    # ``name + ".asc"``, so only two candidates need checking.
+    names = (schema_path.name + ".asc", schema_path.name + ".sig")
+    if entries is None:
+        for name in names:
+            candidate = schema_path.with_name(name)
+            if candidate.exists():
+                return candidate
+        return None
+    for name in names:
+        entry = entries.get(name)
+        # Match Path.exists(): a dangling symlink does not count.
+        if entry is not None and (not entry.is_symlink() or os.path.exists(entry.path)):
+            return schema_path.with_name(name)
     return None
 
 
@@ -233,7 +425,7 @@ def verify_include_signature(
     line: str,
     verbose: bool,
 ) -> None:
-    signature = detect_signature_file(include_path)
+    signature = detect_signature_file(include_path, st.entries(include_path.parent))
     if not signature:
         if REQUIRE_SIGNED_IMPORTS:
             raise ParseError(line_num, f"No signature found for include: {include_path.name}", line)
@@ -242,27 +434,133 @@ def verify_include_signature(
         )
         return
 
-    if shutil.which("gpg") is None:
+    if _pgpy_keyring(line_num, line) is None and shutil.which("gpg") is None:
         raise ParseError(line_num, "GPG executable not available for signature verification", line)
 
-    result = subprocess.run(
-        ["gpg", "--verify", str(signature), str(include_path)],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if result.returncode != 0:
-        stderr = result.stderr.strip()
+    # The gpg call itself is deferred to verify_pending_signatures(); the
+    # report keeps its place in schema order and is filled in there.
+    report = GPGReport(path=str(include_path), verified=False, message="pending")
+    st.gpg_reports.append(report)
+    st.pending_signatures.append((include_path, signature, line_num, line, report))
+
+
+def verify_pending_signatures(pending: List[_PendingSignature], verbose: bool) -> None:
+    """Run ``gpg --verify`` for every queued include signature.
+
+    ``gpg --verify-files`` cannot check detached signatures, so each one still
+    needs its own process; they are started up to ``_GPG_PARALLEL`` at a time
+    so their start-up cost overlaps.  The first failure in schema order is
+    raised once every process has been reaped.
+    """
+
+    if not pending:
+        return
+    keyring = _pgpy_keyring(pending[0][2], pending[0][3])
+    if keyring is not None:
+        _verify_with_pgpy(keyring, pending, verbose)
+        return
+
+    failure: Optional[ParseError] = None
+    for start in range(0, len(pending), _GPG_PARALLEL):
+        batch = pending[start : start + _GPG_PARALLEL]
+        procs: List[subprocess.Popen] = []
+        try:
+            for include_path, signature, _, _, _ in batch:
+                procs.append(
+                    subprocess.Popen(
+                        ["gpg", "--verify", str(signature), str(include_path)],
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                    )
+                )
+            for (include_path, signature, line_num, line, report), proc in zip(batch, procs):
+                _, stderr = proc.communicate()
+                if failure is not None:
+                    continue
+                if proc.returncode != 0:
+                    failure = ParseError(
+                        line_num,
+                        f"GPG signature verification failed for {include_path.name}",
+                        stderr.strip() or line,
+                    )
+                    continue
+                report.verified = True
+                report.signature = str(signature)
+                report.message = None
+                if verbose:
+                    print(f"[tag] verified signature {signature}")
+        finally:
+            # A failed Popen (or an interrupt) must not leave gpg processes
+            # from this batch running or unreaped.
+            for proc in procs:
+                if proc.returncode is None:
+                    proc.kill()
+                    proc.communicate()
+        if failure is not None:
+            raise failure
+    pending.clear()
+
+
+def _pgpy_keyring(line_num: int = 0, line: str = "") -> Optional[object]:
+    """Keyring from ``$LRC_GPG_KEYRING`` if pgpy is installed, else None.
+
+    A keyring that is missing or cannot be parsed raises ParseError against
+    *line_num*/*line*, the include that needed it.
+    """
+
+    path = os.environ.get(GPG_KEYRING_ENV, "")
+    if not path:
+        return None
+    if not os.path.isfile(path):
         raise ParseError(
-            line_num,
-            f"GPG signature verification failed for {include_path.name}",
-            stderr or line,
+            line_num, f"GPG keyring not found: {path} (from ${GPG_KEYRING_ENV})", line
         )
-    st.gpg_reports.append(
-        GPGReport(path=str(include_path), verified=True, signature=str(signature))
-    )
-    if verbose:
-        print(f"[tag] verified signature {signature}")
+    try:
+        return _load_pgpy_keyring(path)
+    except Exception as exc:  # pgpy raises ValueError, PGPError, TypeError, ...
+        raise ParseError(line_num, f"Cannot load GPG keyring {path}: {exc}", line) from exc
+
+
+@functools.lru_cache(maxsize=4)
+def _load_pgpy_keyring(path: str) -> Optional[object]:
+    try:
+        import pgpy  # type: ignore
+    except ImportError:
+        return None
+    keyring = pgpy.PGPKeyring()
+    keyring.load(path)
+    return cast(object, keyring)
+
+
+def _verify_with_pgpy(keyring: object, pending: List[_PendingSignature], verbose: bool) -> None:
+    import pgpy  # type: ignore
+
+    for include_path, signature, line_num, line, report in pending:
+        verified = False
+        try:
+            sig = pgpy.PGPSignature.from_file(str(signature))
+            # keyring.key() raises KeyError when the signer is unknown.
+            detail = f"no public key for signer {sig.signer}"
+            with keyring.key(sig.signer) as key:  # type: ignore[attr-defined]
+                verified = bool(key.verify(include_path.read_bytes(), sig))
+                detail = "bad signature"
+        except KeyError:
+            pass
+        except (OSError, ValueError, pgpy.errors.PGPError) as exc:
+            detail = str(exc)
+        if not verified:
+            raise ParseError(
+                line_num,
+                f"GPG signature verification failed for {include_path.name}",
+                detail or line,
+            )
+        report.verified = True
+        report.signature = str(signature)
+        report.message = None
+        if verbose:
+            print(f"[tag] verified signature {signature}")
+    pending.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -290,6 +588,12 @@ def _iter_template_entries(name: str) -> Iterable[Tuple[str, Optional[str]]]:
                 yield str(relative), text
 
 
+@functools.lru_cache(maxsize=32)
+def _template_entries_cached(name: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    # Packaged templates are immutable at runtime; walk and decode each once.
+    return tuple(_iter_template_entries(name))
+
+
 def template_actions(name: str, st: ParserState, verbose: bool) -> List[Action]:
     acts: List[Action] = []
     normalized = name.lower().strip()
@@ -297,15 +601,14 @@ def template_actions(name: str, st: ParserState, verbose: bool) -> List[Action]:
         raise ParseError(0, f"Template '{name}' is not trusted", name)
 
     try:
-        for rel_path, content in _iter_template_entries(normalized):
+        for rel_path, content in _template_entries_cached(normalized):
             rel_path = expand_vars(rel_path, st.vars)
-            target = st.out_root / rel_path.strip("/")
+            target = Path(os.path.join(st.out_root_str, rel_path.strip("/")))
             if rel_path.endswith("/"):
                 acts.append(Action("mkdir", target))
             else:
                 acts.append(Action("write", target, normalize_line_endings(content or "")))
-                if not IS_WINDOWS and target.suffix in (".sh", ".py"):
-                    acts.append(Action("chmod", target, mode=0o755))
+                _maybe_chmod_exec(acts, target, _TEMPLATE_EXEC_SUFFIXES)
         if verbose:
             print(f"[tag] @template {name} ({len(acts)} actions)")
     except FileNotFoundError:
@@ -313,28 +616,230 @@ def template_actions(name: str, st: ParserState, verbose: bool) -> List[Action]:
     return acts
 
 
+# ---------------------------------------------------------------------------
+# Include parse cache
+#
+# A parsed @include is stored under INCLUDE_CACHE_DIR keyed by the include's
+# content hash and everything else its parse depends on.  Each entry carries a
+# manifest of the includes it pulled in transitively (how each was resolved,
+# and its hash) and its @copy sources; a hit is only used when every include
+# still resolves to the same file inside its base directory with the same
+# content and every copy source is still there, and the manifest's signatures
+# are queued for verification exactly as a parse would.
+# New entries are only written once the root has verified every signature.
+
+
+def _include_cache_key(digest: str, st: ParserState, base_dir: Path) -> str:
+    from . import __version__
+
+    trusted = None if st.trusted_templates is None else sorted(st.trusted_templates)
+    payload = [
+        _INCLUDE_CACHE_FORMAT,
+        __version__,
+        digest,
+        str(st.out_root),
+        str(base_dir),
+        trusted,
+        IS_WINDOWS,
+    ]
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+
+
+def _action_to_json(act: Action) -> Dict[str, object]:
+    return {
+        "kind": act.kind,
+        "path": str(act.path),
+        "content": act.content,
+        "mode": act.mode,
+        "src": None if act.src is None else str(act.src),
+        "target": None if act.target is None else str(act.target),
+    }
+
+
+def _action_from_json(data: Dict[str, object]) -> Action:
+    return Action(
+        data["kind"],  # type: ignore[arg-type]
+        Path(data["path"]),  # type: ignore[arg-type]
+        data["content"],  # type: ignore[arg-type]
+        data["mode"],  # type: ignore[arg-type]
+        None if data["src"] is None else Path(data["src"]),  # type: ignore[arg-type]
+        None if data["target"] is None else Path(data["target"]),  # type: ignore[arg-type]
+    )
+
+
+def _file_digest(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _load_cached_include(key: str, st: ParserState, verbose: bool) -> Optional[ParserResult]:
+    try:
+        data = json.loads((INCLUDE_CACHE_DIR / f"{key}.json").read_bytes())
+        records = [
+            (
+                Path(rec["path"]),
+                int(rec["line_num"]),
+                str(rec["line"]),
+                str(rec["sha256"]),
+                str(rec["base"]),
+                str(rec["leaf"]),
+            )
+            for rec in data["includes"]
+        ]
+        copies = [Path(src) for src in data["copies"]]
+        actions = [_action_from_json(act) for act in data["actions"]]
+        variables = {str(k): str(v) for k, v in data["variables"].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+    for inc_path, _, _, digest, base, leaf in records:
+        # Resolve each nested @include again, as a parse would: a moved symlink
+        # can point the same line at another file or outside its base.
+        base_real = os.path.normcase(os.path.realpath(base))
+        if _resolve_under(Path(base), leaf, base_real) != inc_path:
+            return None
+        if _file_digest(inc_path) != digest:
+            return None
+    if not all(st.exists(src) for src in copies):
+        return None
+    # Copy paths were stored fully resolved and checked for containment; if
+    # one no longer resolves to itself a symlink has moved, so parse afresh.
+    for act in actions:
+        if act.kind == "copy" and not (
+            _still_real(act.src) and _still_real(act.path)  # type: ignore[arg-type]
+        ):
+            return None
+    try:
+        os.utime(INCLUDE_CACHE_DIR / f"{key}.json")
+    except OSError:
+        pass
+
+    for record in records:
+        inc_path, line_num, line = record[:3]
+        verify_include_signature(inc_path, st, line_num, line, verbose)
+        st.include_records.append(record)
+    st.copy_sources.extend(copies)
+    return ParserResult(actions=actions, metadata={}, variables=variables, ignores=[])
+
+
+def _still_real(path: Path) -> bool:
+    return os.path.realpath(path) == os.fspath(path)
+
+
+def _flush_cache_stores(pending: List[_PendingCacheStore]) -> None:
+    if pending:
+        for entry in pending:
+            _store_cached_include(*entry)
+        pending.clear()
+        _prune_include_cache()
+
+
+def _prune_include_cache() -> None:
+    entries: List[Tuple[float, int, str]] = []
+    try:
+        with os.scandir(INCLUDE_CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    info = entry.stat()
+                    entries.append((info.st_mtime, info.st_size, entry.path))
+    except OSError:
+        return
+    cutoff = time.time() - _INCLUDE_CACHE_MAX_AGE
+    total = sum(size for _, size, _ in entries)
+    # Oldest first: expired entries, then whatever keeps the total over bound.
+    for mtime, size, path in sorted(entries):
+        if mtime >= cutoff and total <= _INCLUDE_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def _store_cached_include(
+    key: str,
+    result: ParserResult,
+    records: List[_IncludeRecord],
+    copies: List[Path],
+) -> None:
+    entry = {
+        "actions": [_action_to_json(act) for act in result.actions],
+        "variables": result.variables,
+        "includes": [
+            {
+                "path": str(path),
+                "line_num": line_num,
+                "line": line,
+                "sha256": digest,
+                "base": base,
+                "leaf": leaf,
+            }
+            for path, line_num, line, digest, base, leaf in records
+        ],
+        "copies": [str(src) for src in copies],
+    }
+    target = INCLUDE_CACHE_DIR / f"{key}.json"
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        INCLUDE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
 # ---------------------------------------------------------------------------
 # Parsing implementation
 
 
 def parse_schema(
-    schema_text: str,
+    schema_text: Union[str, bytes],
     out_root: Path,
     base_dir: Path,
-    *,
     verbose: bool = False,
 ) -> ParserResult:
-    st = ParserState(out_root)
+    # Symlinks may have moved since the last parse in this process.
+    clear_path_cache()
+    return _parse_schema(schema_text, out_root, base_dir, verbose, None)
+
+
+def _parse_schema(
+    schema_text: Union[str, bytes],
+    out_root: Path,
+    base_dir: Path,
+    verbose: bool,
+    parent: Optional[ParserState],
+) -> ParserResult:
+    # Includes share the root's bookkeeping and template policy.
+    st = ParserState(out_root, parent)
     st.base_dir = base_dir
-    st.trusted_templates = load_trusted_templates(base_dir)
+    # Resolved directly rather than through the _resolved() memo, so the
+    # containment checks always see where the base points right now.
+    st.base_real = os.path.normcase(os.path.realpath(base_dir))
+    st.out_real = (
+        parent.out_real if parent else os.path.normcase(os.path.realpath(out_root))
+    )
+    st.trusted_templates = (
+        parent.trusted_templates if parent else load_trusted_templates(base_dir)
+    )
+    if isinstance(schema_text, bytes):
+        schema_text = schema_text.decode("utf-8")
     lines = schema_text.splitlines()
+    # Indentation for every line in one pass rather than per _parse_line call.
+    leading = [len(line) - len(line.lstrip()) for line in lines]
 
-    _extract_metadata_and_vars(lines, st, verbose)
+    _hoist_metadata_and_vars(lines, st)
 
     index = 0
     while index < len(lines):
         try:
-            index = _parse_line(lines, index, st, base_dir, verbose)
+            index = _parse_line(lines, leading, index, st, base_dir, verbose)
         except ParseError:
             raise
         except Exception as exc:  # pragma: no cover - defensive
@@ -344,6 +849,10 @@ def parse_schema(
                 lines[index] if index < len(lines) else "",
             )
 
+    if parent is None:
+        verify_pending_signatures(st.pending_signatures, verbose)
+        _flush_cache_stores(st.pending_cache_stores)
+
     if st.ignores:
         st.actions = _filter_ignored_actions(st.actions, st.ignores, verbose)
 
@@ -356,40 +865,40 @@ def parse_schema(
     )
 
 
-def _extract_metadata_and_vars(lines: List[str], st: ParserState, verbose: bool) -> None:
-    for raw in lines:
-        line = raw.rstrip()
-        if not line.strip():
-            continue
+def _hoist_metadata_and_vars(lines: List[str], st: ParserState) -> None:
+    """Apply metadata comments and ``@set`` before the structure pass.
+
+    Like lrc.core, a variable is visible to lines above its ``@set``.
+    """
 
-        stripped = line.strip()
+    for raw in lines:
+        stripped = raw.strip()
         if stripped.startswith("#"):
-            body = stripped.lstrip("#").strip()
-            for key in ("Project", "Description", "Version"):
-                prefix = f"{key}:"
-                if body.lower().startswith(prefix.lower()):
-                    value = body[len(prefix) :].strip()
-                    if value:
-                        st.meta[key] = value
-                        st.vars[key.upper()] = value
-                        if key == "Project" and not st.vars.get("PKG"):
-                            st.vars["PKG"] = re.sub(r"[^a-zA-Z0-9]+", "-", value).lower()
-            continue
+            _record_metadata(stripped, st)
+        elif stripped.startswith("@set "):
+            key, sep, value = stripped[len("@set ") :].partition("=")
+            if sep:
+                st.vars[key.strip()] = value.strip()
 
-        if stripped.startswith("@set "):
-            body = stripped[len("@set ") :].strip()
-            if "=" not in body:
-                continue
-            key, value = body.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            st.vars[key] = value
-            if verbose:
-                print(f"[parse] @set {key} = {value}")
+
+def _record_metadata(stripped: str, st: ParserState) -> None:
+    """Pick ``# Project:``/``# Description:``/``# Version:`` out of a comment."""
+
+    name, sep, rest = stripped.lstrip("#").strip().partition(":")
+    key = _META_KEYS.get(name.lower()) if sep else None
+    if key is None:
+        return
+    value = rest.strip()
+    if value:
+        st.meta[key] = value
+        st.vars[key.upper()] = value
+        if key == "Project" and not st.vars.get("PKG"):
+            st.vars["PKG"] = _SLUG_RE.sub("-", value).lower()
 
 
 def _parse_line(
     lines: List[str],
+    leading: List[int],
     index: int,
     st: ParserState,
     base_dir: Path,
@@ -398,20 +907,20 @@ def _parse_line(
     raw = lines[index]
     line_num = index + 1
 
-    if not raw.strip() or raw.lstrip().startswith("#"):
+    stripped = raw.strip()
+    if not stripped or stripped.startswith("#"):
         return index + 1
 
-    stripped = raw.strip()
     if stripped.startswith("@"):
         return _handle_directive(stripped, st, base_dir, line_num, verbose, index, lines)
 
     if st.heredoc_stack:
         return _handle_heredoc_continuation(raw, lines, index, st, line_num, verbose)
 
-    leading_spaces = len(raw) - len(raw.lstrip())
+    leading_spaces = leading[index]
     _adjust_directory_stack(leading_spaces, st)
 
-    entry = raw.strip()
+    entry = stripped
     if entry.startswith("/"):
         return _handle_absolute_section(entry, st, line_num, verbose)
     if entry.endswith("/") and "->" not in entry and "<<" not in entry:
@@ -437,8 +946,8 @@ def _handle_absolute_section(entry: str, st: ParserState, line_num: int, verbose
     if section.endswith("/"):
         section = section[:-1]
     section = expand_vars(section, st.vars)
-    new_dir = st.out_root / Path(section)
-    st.actions.append(Action("mkdir", new_dir))
+    new_dir = os.path.join(st.out_root_str, section)
+    st.actions.append(Action("mkdir", st.dir_path(new_dir)))
     if st.indent_stack[-1] == (len(entry) - len(entry.lstrip())):
         st.dir_stack[-1] = new_dir
     else:
@@ -456,14 +965,15 @@ def _handle_directory(
     verbose: bool,
 ) -> int:
     dir_name = expand_vars(entry[:-1].strip(), st.vars)
-    new_dir = st.current_dir() / dir_name
-    st.actions.append(Action("mkdir", new_dir))
+    new_dir = os.path.join(st.current_dir(), dir_name)
+    new_path = st.dir_path(new_dir)
+    st.actions.append(Action("mkdir", new_path))
     if st.indent_stack and (leading_spaces > st.indent_stack[-1]):
         st.dir_stack.append(new_dir)
     else:
         st.dir_stack[-1] = new_dir
     if verbose:
-        print(f"[parse] L{line_num}: dir {new_dir}")
+        print(f"[parse] L{line_num}: dir {new_path}")
     return line_num
 
 
@@ -478,7 +988,7 @@ def _handle_heredoc_start(
     left, marker = entry.split("<<", 1)
     file_name = expand_vars(left.strip(), st.vars)
     marker = marker.strip() or "EOF"
-    target_path = st.current_dir() / file_name
+    target_path = Path(os.path.join(st.current_dir(), file_name))
     if not validate_file_extension(file_name):
         raise ParseError(line_num, f"Potentially dangerous file extension: {file_name}", entry)
     st.heredoc_stack.append((marker, target_path, index + 1))
@@ -497,13 +1007,14 @@ def _handle_heredoc_continuation(
 ) -> int:
     marker, target_path, start_line = st.heredoc_stack[-1]
     if raw.strip() == marker:
-        content_lines = lines[start_line:index]
-        content = "\n".join(content_lines)
+        # str.join() turns any iterable into a list first, and islice() would
+        # also step over every line before start_line. A plain slice is the
+        # cheapest way to hand it the body.
+        content = "\n".join(lines[start_line:index])
         content = expand_vars(content, st.vars)
         content = normalize_line_endings(content)
         st.actions.append(Action("write", target_path, content))
-        if not IS_WINDOWS and target_path.suffix in (".sh", ".py", ".pl", ".rb"):
-            st.actions.append(Action("chmod", target_path, mode=0o755))
+        _maybe_chmod_exec(st.actions, target_path)
         if verbose:
             print(
                 f"[parse] L{start_line}-{line_num - 1}: heredoc {target_path} ({len(content)} bytes)"
@@ -520,27 +1031,25 @@ def _handle_inline_file(entry: str, st: ParserState, line_num: int, verbose: boo
         raise ParseError(line_num, f"Potentially dangerous file extension: {file_name}", entry)
     content = expand_vars(right.lstrip(), st.vars)
     content = normalize_line_endings(content)
-    target_path = st.current_dir() / file_name
+    target_path = Path(os.path.join(st.current_dir(), file_name))
     st.actions.append(Action("write", target_path, content))
-    if not IS_WINDOWS and target_path.suffix in (".sh", ".py", ".pl", ".rb"):
-        st.actions.append(Action("chmod", target_path, mode=0o755))
+    _maybe_chmod_exec(st.actions, target_path)
     if verbose:
         print(f"[parse] L{line_num}: file {target_path} (inline, {len(content)} chars)")
-    return line_num + 1
+    return line_num
 
 
 def _handle_plain_file(entry: str, st: ParserState, line_num: int, verbose: bool) -> int:
     file_name = expand_vars(entry, st.vars)
     if not validate_file_extension(file_name):
         raise ParseError(line_num, f"Potentially dangerous file extension: {file_name}", entry)
-    target_path = st.current_dir() / file_name
+    target_path = Path(os.path.join(st.current_dir(), file_name))
     st.actions.append(Action("mkdir", target_path.parent))
     st.actions.append(Action("write", target_path, ""))
-    if not IS_WINDOWS and target_path.suffix in (".sh", ".py", ".pl", ".rb"):
-        st.actions.append(Action("chmod", target_path, mode=0o755))
+    _maybe_chmod_exec(st.actions, target_path)
     if verbose:
         print(f"[parse] L{line_num}: file {target_path} (empty)")
-    return line_num + 1
+    return line_num
 
 
 def _handle_directive(
@@ -552,94 +1061,145 @@ def _handle_directive(
     index: int,
     lines: List[str],
 ) -> int:
-    if line.startswith("@set "):
-        body = line[len("@set ") :].strip()
-        if "=" not in body:
-            raise ParseError(line_num, "Invalid @set syntax, use: @set KEY=VALUE", line)
-        key, value = body.split("=", 1)
-        st.vars[key.strip()] = value.strip()
-        if verbose:
-            print(f"[tag] @set {key.strip()} = {value.strip()}")
-        return index + 1
+    # Any whitespace separates the name from its arguments, tabs included.
+    head, *rest = line.split(None, 1)
+    # Only @ignore may appear without arguments; other bare names stay unknown.
+    handler = _DIRECTIVES.get(head) if rest or head == "@ignore" else None
+    if handler is None:
+        raise ParseError(line_num, f"Unknown directive: {head}", line)
+    handler(rest[0].strip() if rest else "", line, st, base_dir, line_num, verbose)
+    return index + 1
 
-    if line.startswith("@include "):
-        inc_file = expand_vars(line[len("@include ") :].strip(), st.vars)
-        inc_path = (base_dir / inc_file).resolve()
-        if not is_safe_under_base(inc_path, base_dir):
-            raise ParseError(line_num, f"Included file path traversal detected: {inc_file}", line)
-        if not inc_path.exists():
-            raise ParseError(line_num, f"Included file not found: {inc_file}", line)
-        verify_include_signature(inc_path, st, line_num, line, verbose)
-        included_text = inc_path.read_text(encoding="utf-8")
-        result = parse_schema(included_text, st.out_root, inc_path.parent, verbose=verbose)
-        st.actions.extend(result.actions)
-        st.vars.update(result.variables)
+
+def _directive_set(
+    rest: str, line: str, st: ParserState, base_dir: Path, line_num: int, verbose: bool
+) -> None:
+    if "=" not in rest:
+        raise ParseError(line_num, "Invalid @set syntax, use: @set KEY=VALUE", line)
+    key, value = rest.split("=", 1)
+    st.vars[key.strip()] = value.strip()
+    if verbose:
+        print(f"[tag] @set {key.strip()} = {value.strip()}")
+
+
+def _directive_include(
+    rest: str, line: str, st: ParserState, base_dir: Path, line_num: int, verbose: bool
+) -> None:
+    inc_file = expand_vars(rest, st.vars)
+    inc_path = _resolve_under(base_dir, inc_file, st.base_real)
+    if inc_path is None:
+        raise ParseError(line_num, f"Included file path traversal detected: {inc_file}", line)
+    if not st.exists(inc_path):
+        raise ParseError(line_num, f"Included file not found: {inc_file}", line)
+    verify_include_signature(inc_path, st, line_num, line, verbose)
+    included = inc_path.read_bytes()
+    digest = hashlib.sha256(included).hexdigest()
+    st.include_records.append(
+        (inc_path, line_num, line, digest, os.fspath(base_dir), inc_file)
+    )
+
+    # Verbose runs always re-parse so every [parse] line is still printed.
+    key: Optional[str] = None
+    result: Optional[ParserResult] = None
+    if INCLUDE_CACHE_ENABLED and not verbose:
+        key = _include_cache_key(digest, st, inc_path.parent)
+        result = _load_cached_include(key, st, verbose)
+    if result is None:
+        records_start = len(st.include_records)
+        copies_start = len(st.copy_sources)
+        result = _parse_schema(included, st.out_root, inc_path.parent, verbose, st)
         st.gpg_reports.extend(result.gpg_reports)
-        return index + 1
+        if key is not None:
+            st.pending_cache_stores.append(
+                (
+                    key,
+                    result,
+                    st.include_records[records_start:],
+                    st.copy_sources[copies_start:],
+                )
+            )
+    st.actions.extend(result.actions)
+    st.vars.update(result.variables)
 
-    if line.startswith("@ignore"):
-        patterns = line.split()[1:]
-        st.ignores.extend(patterns)
-        if verbose:
-            print(f"[tag] @ignore {patterns}")
-        return index + 1
 
-    if line.startswith("@chmod "):
-        rest = line[len("@chmod ") :].strip()
-        parts = rest.split()
-        if len(parts) < 2:
-            raise ParseError(line_num, "Invalid @chmod syntax, use: @chmod PATH MODE", line)
-        path_str, mode_str = parts[0], parts[1]
-        target_path = st.out_root / expand_vars(path_str, st.vars)
-        mode = _parse_chmod_mode(mode_str)
-        st.actions.append(Action("chmod", target_path, mode=mode))
-        if verbose:
-            print(f"[tag] @chmod {target_path} {oct(mode)}")
-        return index + 1
+def _directive_ignore(
+    rest: str, line: str, st: ParserState, base_dir: Path, line_num: int, verbose: bool
+) -> None:
+    patterns = rest.split()
+    st.ignores.extend(patterns)
+    if verbose:
+        print(f"[tag] @ignore {patterns}")
 
-    if line.startswith("@copy "):
-        rest = line[len("@copy ") :].strip()
-        parts = rest.split()
-        if len(parts) < 2:
-            raise ParseError(line_num, "Invalid @copy syntax, use: @copy SRC DEST", line)
-        src_str, dest_str = parts[0], parts[1]
-        src_path = (base_dir / expand_vars(src_str, st.vars)).resolve()
-        dest_path = (st.out_root / expand_vars(dest_str, st.vars)).resolve()
-        if not is_safe_under_base(src_path, base_dir):
-            raise ParseError(line_num, f"Copy source path traversal detected: {src_str}", line)
-        if not is_safe_under_base(dest_path, st.out_root):
-            raise ParseError(line_num, f"Copy destination path traversal detected: {dest_str}", line)
-        if not src_path.exists():
-            raise ParseError(line_num, f"Copy source not found: {src_path}", line)
-        st.actions.append(Action("copy", dest_path, src=src_path))
-        if verbose:
-            print(f"[tag] @copy {src_path} -> {dest_path}")
-        return index + 1
 
-    if line.startswith("@template "):
-        template_name = line[len("@template ") :].strip()
-        acts = template_actions(template_name, st, verbose)
-        st.actions.extend(acts)
-        return index + 1
+def _directive_chmod(
+    rest: str, line: str, st: ParserState, base_dir: Path, line_num: int, verbose: bool
+) -> None:
+    parts = rest.split()
+    if len(parts) < 2:
+        raise ParseError(line_num, "Invalid @chmod syntax, use: @chmod PATH MODE", line)
+    path_str, mode_str = parts[0], parts[1]
+    target_path = st.out_root / expand_vars(path_str, st.vars)
+    mode = _parse_chmod_mode(mode_str)
+    st.actions.append(Action("chmod", target_path, mode=mode))
+    if verbose:
+        print(f"[tag] @chmod {target_path} {oct(mode)}")
 
-    if line.startswith("@symlink "):
-        rest = line[len("@symlink ") :].strip()
-        parts = rest.split()
-        if len(parts) < 2:
-            raise ParseError(
-                line_num,
-                "Invalid @symlink syntax, use: @symlink TARGET LINKNAME",
-                line,
-            )
-        target_str, link_str = parts[0], parts[1]
-        target_path = Path(expand_vars(target_str, st.vars))
-        link_path = st.out_root / expand_vars(link_str, st.vars)
-        st.actions.append(Action("symlink", link_path, target=target_path))
-        if verbose:
-            print(f"[tag] @symlink {target_path} -> {link_path}")
-        return index + 1
 
-    raise ParseError(line_num, f"Unknown directive: {line.split()[0]}", line)
+def _directive_copy(
+    rest: str, line: str, st: ParserState, base_dir: Path, line_num: int, verbose: bool
+) -> None:
+    parts = rest.split()
+    if len(parts) < 2:
+        raise ParseError(line_num, "Invalid @copy syntax, use: @copy SRC DEST", line)
+    src_str, dest_str = parts[0], parts[1]
+    # Resolved once each; the containment checks reuse the result.
+    src_path = _resolve_under(base_dir, expand_vars(src_str, st.vars), st.base_real)
+    if src_path is None:
+        raise ParseError(line_num, f"Copy source path traversal detected: {src_str}", line)
+    dest_path = _resolve_under(st.out_root, expand_vars(dest_str, st.vars), st.out_real)
+    if dest_path is None:
+        raise ParseError(line_num, f"Copy destination path traversal detected: {dest_str}", line)
+    if not st.exists(src_path):
+        raise ParseError(line_num, f"Copy source not found: {src_path}", line)
+    st.actions.append(Action("copy", dest_path, src=src_path))
+    st.copy_sources.append(src_path)
+    if verbose:
+        print(f"[tag] @copy {src_path} -> {dest_path}")
+
+
+def _directive_template(
+    rest: str, line: str, st: ParserState, base_dir: Path, line_num: int, verbose: bool
+) -> None:
+    st.actions.extend(template_actions(rest, st, verbose))
+
+
+def _directive_symlink(
+    rest: str, line: str, st: ParserState, base_dir: Path, line_num: int, verbose: bool
+) -> None:
+    parts = rest.split()
+    if len(parts) < 2:
+        raise ParseError(
+            line_num,
+            "Invalid @symlink syntax, use: @symlink TARGET LINKNAME",
+            line,
+        )
+    target_str, link_str = parts[0], parts[1]
+    target_path = Path(expand_vars(target_str, st.vars))
+    link_path = st.out_root / expand_vars(link_str, st.vars)
+    st.actions.append(Action("symlink", link_path, target=target_path))
+    if verbose:
+        print(f"[tag] @symlink {target_path} -> {link_path}")
+
+
+_DIRECTIVES: Dict[str, _DirectiveHandler] = {
+    "@set": _directive_set,
+    "@include": _directive_include,
+    "@ignore": _directive_ignore,
+    "@chmod": _directive_chmod,
+    "@copy": _directive_copy,
+    "@template": _directive_template,
+    "@symlink": _directive_symlink,
+}
 
 
 def _parse_chmod_mode(mode_str: str) -> int:
@@ -658,12 +1218,19 @@ def _parse_chmod_mode(mode_str: str) -> int:
 
 
 def _filter_ignored_actions(actions: List[Action], ignores: List[str], verbose: bool) -> List[Action]:
+    # Translate each glob once; fnmatch.fnmatch() would redo the normcase,
+    # translate and cache lookup for every (action, pattern) pair.
+    matchers = [
+        (pattern, re.compile(fnmatch.translate(os.path.normcase(pattern))).match)
+        for pattern in ignores
+    ]
     filtered: List[Action] = []
     for act in actions:
-        rel_path = str(act.path)
+        rel_path = act.path_str
+        norm_path = os.path.normcase(rel_path)
         skip = False
-        for pattern in ignores:
-            if pattern in rel_path or fnmatch.fnmatch(rel_path, pattern):
+        for pattern, match in matchers:
+            if pattern in rel_path or match(norm_path):
                 skip = True
                 if verbose:
                     print(f"[filter] ignore {act.path} (pattern: {pattern})")
@@ -674,12 +1241,13 @@ def _filter_ignored_actions(actions: List[Action], ignores: List[str], verbose:
 
 
 def coalesce_mkdirs(actions: List[Action]) -> List[Action]:
-    seen_dirs = set()
+    # Key on the cached path string; hashing Path objects is far slower.
+    seen_dirs: set[str] = set()
     result: List[Action] = []
     for act in actions:
         if act.kind == "mkdir":
-            if act.path not in seen_dirs:
-                seen_dirs.add(act.path)
+            if act.path_str not in seen_dirs:
+                seen_dirs.add(act.path_str)
                 result.append(act)
         else:
             result.append(act)
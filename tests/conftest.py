@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from lrc import parser
+
+_REAL_POPEN = subprocess.Popen
+
+
+@pytest.fixture
+def fake_gpg(monkeypatch):
+    """Stand in for ``gpg`` in lrc.parser.
+
+    Call the fixture with ``returncode`` (and optionally ``stderr``) to make
+    every gpg run a Python process that exits that way, or with ``popen`` to
+    install a custom ``subprocess.Popen`` replacement.
+    """
+
+    def install(returncode: int = 0, stderr: str = "", popen=None) -> None:
+        if popen is None:
+            script = "import sys; sys.stderr.write(%r); sys.exit(%d)" % (
+                stderr,
+                returncode,
+            )
+
+            def popen(cmd, **kwargs):
+                return _REAL_POPEN([sys.executable, "-c", script], **kwargs)
+
+        monkeypatch.delenv("LRC_GPG_KEYRING", raising=False)
+        monkeypatch.setattr(parser.shutil, "which", lambda name: "/usr/bin/" + name)
+        monkeypatch.setattr(parser.subprocess, "Popen", popen)
+
+    return install
@@ -1,8 +1,9 @@
 import json
 from pathlib import Path
 
-from lrc.main import main
+import pytest
 
+from lrc.main import main
 
 SCHEMA = Path("tests/data/simple.lrc")
 
@@ -22,3 +23,44 @@ def test_cli_generates_manifest(tmp_path):
     assert manifest.exists()
     data = json.loads(manifest.read_text())
     assert data["project"] == "demo-app"
+
+
+def test_cli_without_arguments_prints_short_usage(capsys):
+    code = main([])
+    captured = capsys.readouterr()
+    assert code == 2
+    assert "usage:" in captured.err.lower()
+    assert captured.out == ""
+
+
+def test_short_usage_matches_argparse(capsys, monkeypatch):
+    from lrc.main import _SCHEMA_REQUIRED, _SHORT_USAGE, _select_parser
+
+    # argparse wraps usage to the terminal width; the fixed text is 80 columns.
+    monkeypatch.setenv("COLUMNS", "80")
+    with pytest.raises(SystemExit) as exc:
+        _select_parser([]).error(_SCHEMA_REQUIRED)
+    assert exc.value.code == 2
+    assert capsys.readouterr().err == _SHORT_USAGE
+
+
+def test_cli_version_fast_path(capsys):
+    from lrc import __version__
+
+    assert main(["--version"]) == 0
+    assert capsys.readouterr().out.strip() == f"lrc {__version__}"
+
+
+def test_cli_fast_path_matches_argparse_on_unknown_flag(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main([str(SCHEMA), "--out", str(tmp_path / "x"), "--no-such-flag"])
+    assert exc.value.code == 2
+    assert "--no-such-flag" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("flag", ["-h", "--help", "--he", "-vh"])
+def test_help_lists_audit_options(flag, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main([flag])
+    assert exc.value.code == 0
+    assert "--audit-format" in capsys.readouterr().out
@@ -24,3 +24,31 @@ def test_cli_runs_audit_skip(tmp_path: Path, capsys) -> None:
     assert exit_code == 0
     assert output_dir.exists()
     assert "[AUDIT]" in captured.out
+
+
+def test_cli_reports_unreadable_schema(tmp_path: Path, capsys) -> None:
+    schema_dir = tmp_path / "schema.lrc"
+    schema_dir.mkdir()
+
+    exit_code = cli_main([str(schema_dir), "--output", str(tmp_path / "out")])
+    captured = capsys.readouterr()
+
+    assert exit_code == 1
+    assert "[ERROR]" in captured.out
+
+
+def test_cli_ignores_an_empty_project_line(tmp_path: Path, monkeypatch) -> None:
+    from lrc import core
+
+    schema = tmp_path / "schema.lrc"
+    schema.write_text("# Project:\n/src\n", encoding="utf-8")
+    names = []
+
+    def default_dir(project_name=None):
+        names.append(project_name)
+        return tmp_path / "out"
+
+    monkeypatch.setattr(core, "get_default_output_dir", default_dir)
+
+    assert cli_main([str(schema), "--dry-run"]) == 0
+    assert names == [None]
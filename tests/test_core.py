@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from lrc import core
+from lrc.core import Action, parse_schema, realize
+
+
+def test_write_never_overwrites_without_force(tmp_path: Path, monkeypatch) -> None:
+    existing = tmp_path / "readme.md"
+    existing.write_text("original")
+    # Simulate a listing that missed the entry, e.g. README.md vs readme.md
+    # on a case-insensitive filesystem.
+    monkeypatch.setattr(core, "_exists", lambda path, children: False)
+
+    result = realize([Action(kind="write", path=existing, content="new")], tmp_path)
+
+    assert existing.read_text() == "original"
+    assert result.warnings == [
+        f"Skipping existing file (use --force to overwrite): {existing}"
+    ]
+
+
+def test_exists_confirms_listing_misses_on_case_folding_platforms(
+    tmp_path: Path, monkeypatch
+) -> None:
+    (tmp_path / "README.md").write_text("x")
+    children = {tmp_path: {"readme.md"}}
+
+    monkeypatch.setattr(core, "IS_WINDOWS", False)
+    monkeypatch.setattr(core, "IS_MACOS", False)
+    assert not core._exists(tmp_path / "README.md", children)
+
+    monkeypatch.setattr(core, "IS_MACOS", True)
+    assert core._exists(tmp_path / "README.md", children)
+
+
+def test_directories_behind_a_symlink_are_made_through_it(tmp_path: Path) -> None:
+    real, link = tmp_path / "real", tmp_path / "link"
+    actions = [
+        Action(kind="mkdir", path=real),
+        Action(kind="symlink", path=link, target=Path("real")),
+        Action(kind="mkdir", path=link),
+        Action(kind="write", path=link / "sub" / "b.txt", content="b"),
+    ]
+
+    result = realize(actions, tmp_path)
+
+    assert result.success and not result.warnings
+    assert link.is_symlink()
+    assert (real / "sub" / "b.txt").read_text() == "b"
+
+
+def test_lines_after_file_entries_are_parsed(tmp_path: Path) -> None:
+    schema = "/a\n  f.txt -> hi\n  g.txt\n  h.txt -> ${X}\n@set X=1\n"
+    actions, _, _ = parse_schema(schema, tmp_path, tmp_path)
+    written = {
+        a.path.relative_to(tmp_path): a.content for a in actions if a.kind == "write"
+    }
+    assert written == {Path("a/f.txt"): "hi", Path("a/g.txt"): "", Path("a/h.txt"): "1"}
+
+
+def test_both_parsers_hoist_metadata_and_set(tmp_path: Path) -> None:
+    from lrc import parser
+
+    schema = "/${PROJECT}-${X}\n  VERSION -> ${VERSION}\n# Project: demo\n# Version: 2\n@set X=1\n"
+    actions, meta, vars_ = parse_schema(schema, tmp_path, tmp_path)
+    result = parser.parse_schema(schema, tmp_path, tmp_path)
+
+    def writes(items):
+        return {
+            str(a.path.relative_to(tmp_path)): a.content
+            for a in items
+            if a.kind == "write"
+        }
+
+    assert writes(actions) == writes(result.actions) == {"demo-1/VERSION": "2"}
+    assert meta == result.metadata
+    assert vars_["X"] == result.variables["X"] == "1"
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client
+from pathlib import Path
+
+import pytest
+
+from lrc import daemon
+from lrc.main import _VERSION_STRING
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="the daemon needs fork and Unix sockets"
+)
+
+
+@pytest.fixture
+def sock_dir(monkeypatch):
+    # Unix socket paths are length-limited, so stay clear of deep tmp_path dirs.
+    with tempfile.TemporaryDirectory(prefix="lrc-") as tmp:
+        sock = Path(tmp) / "lrc" / "sock-test"
+        monkeypatch.setattr(daemon, "SOCKET_PATH", sock)
+        monkeypatch.setattr(daemon, "KEY_PATH", sock.with_name("sock-test.key"))
+        monkeypatch.setattr(daemon, "FAILED_PATH", sock.with_name("sock-test.failed"))
+        yield sock
+        daemon.stop()
+
+
+def test_dispatch_without_server_spawns_and_falls_back(sock_dir, monkeypatch) -> None:
+    spawned = []
+    monkeypatch.setattr(daemon, "spawn", lambda wait: spawned.append(wait) or True)
+
+    assert daemon.dispatch(["--version"]) is None
+    assert spawned == [False]
+
+
+def test_dispatch_rejects_server_without_matching_key(sock_dir, monkeypatch) -> None:
+    assert daemon.spawn() is True
+    authkey = daemon.KEY_PATH.read_bytes()
+    daemon.KEY_PATH.write_bytes(b"wrong key")
+    monkeypatch.setattr(daemon, "spawn", lambda wait: True)
+    try:
+        assert daemon.dispatch(["--version"]) is None
+    finally:
+        daemon.KEY_PATH.write_bytes(authkey)
+
+
+def test_dispatch_round_trip(sock_dir, capfd) -> None:
+    assert daemon.spawn() is True
+    assert oct(daemon.KEY_PATH.stat().st_mode & 0o777) == "0o600"
+
+    assert daemon.dispatch(["--version"]) == 0
+    assert _VERSION_STRING in capfd.readouterr().out
+
+    assert daemon.stop() is True
+    assert daemon.stop() is False
+
+
+def test_dispatch_declines_when_settings_differ(sock_dir, monkeypatch) -> None:
+    monkeypatch.delenv("LRC_REQUIRE_SIGNED_INCLUDES", raising=False)
+    assert daemon.spawn() is True
+
+    monkeypatch.setenv("LRC_REQUIRE_SIGNED_INCLUDES", "1")
+    assert daemon.dispatch(["--version"]) is None
+
+
+def test_spawn_reports_startup_failure(sock_dir, monkeypatch, capsys) -> None:
+    sock_dir.parent.parent.chmod(0o500)
+    try:
+        if os.access(sock_dir.parent.parent, os.W_OK):
+            pytest.skip("running with permissions that ignore directory modes")
+        assert daemon.spawn() is False
+    finally:
+        sock_dir.parent.parent.chmod(0o700)
+
+    assert "[ERROR] lrc daemon failed to start" in capsys.readouterr().err
+
+
+def test_server_exits_when_idle(sock_dir, monkeypatch) -> None:
+    monkeypatch.setattr(daemon, "IDLE_TIMEOUT", 1)
+    assert daemon.spawn() is True
+
+    deadline = time.monotonic() + 10
+    while daemon.KEY_PATH.exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+    assert not daemon.KEY_PATH.exists()
+    assert not sock_dir.exists()
+    assert daemon.stop() is False
+
+
+def test_failed_start_is_recorded_and_backs_off(sock_dir, monkeypatch, capfd) -> None:
+    def broken_listener(*args, **kwargs):
+        raise OSError("no listener")
+
+    monkeypatch.setattr(daemon, "Listener", broken_listener)
+    assert daemon.dispatch(["--version"]) is None
+
+    deadline = time.monotonic() + 10
+    while not daemon.FAILED_PATH.exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert "OSError: no listener" in daemon.FAILED_PATH.read_text()
+
+    spawned = []
+    monkeypatch.setattr(daemon, "spawn", lambda wait: spawned.append(wait) or True)
+    assert daemon.dispatch(["--version"]) is None
+    assert spawned == []
+    assert capfd.readouterr().err == ""
+
+
+def test_dispatch_never_forks_without_a_socket_directory(
+    sock_dir, monkeypatch, capfd
+) -> None:
+    blocker = sock_dir.parent.parent / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(daemon, "SOCKET_PATH", blocker / "lrc" / "sock-test")
+    monkeypatch.setattr(daemon.os, "fork", lambda: pytest.fail("forked"))
+
+    assert daemon.dispatch(["--version"]) is None
+    assert capfd.readouterr().err == ""
+
+
+def test_daemon_flag_with_a_server_running_succeeds(sock_dir, monkeypatch) -> None:
+    from lrc.main import main
+
+    assert daemon.spawn() is True
+    monkeypatch.setenv(daemon.ENV_FLAG, "1")
+    monkeypatch.setattr(
+        daemon, "dispatch", lambda argv: pytest.fail("forwarded --daemon")
+    )
+
+    assert main(["--daemon"]) == 0
+
+
+def test_clients_refuse_a_socket_directory_others_can_reach(
+    sock_dir, monkeypatch
+) -> None:
+    assert daemon.spawn() is True
+    monkeypatch.setattr(daemon, "spawn", lambda wait: True)
+    sock_dir.parent.chmod(0o770)
+    try:
+        assert daemon.dispatch(["--version"]) is None
+        assert daemon.stop() is False
+    finally:
+        sock_dir.parent.chmod(0o700)
+    assert daemon.dispatch(["--version"]) == 0
+
+
+def test_requests_run_with_the_client_umask(sock_dir, tmp_path) -> None:
+    assert daemon.spawn() is True
+    schema = tmp_path / "app.lrc"
+    schema.write_text("/pkg\n  f.txt -> x\n", encoding="utf-8")
+    out = tmp_path / "out"
+
+    previous = os.umask(0o077)
+    try:
+        assert daemon.dispatch([str(schema), "--out", str(out)]) == 0
+    finally:
+        os.umask(previous)
+
+    assert (out / "pkg" / "f.txt").stat().st_mode & 0o777 == 0o600
+
+
+def test_an_idle_client_does_not_block_other_requests(sock_dir) -> None:
+    assert daemon.spawn() is True
+    idle = Client(
+        str(daemon.SOCKET_PATH), family="AF_UNIX", authkey=daemon.KEY_PATH.read_bytes()
+    )
+    codes = []
+    worker = threading.Thread(
+        target=lambda: codes.append(daemon.dispatch(["--version"]))
+    )
+    worker.daemon = True
+    try:
+        worker.start()
+        worker.join(10)
+    finally:
+        idle.close()
+
+    assert codes == [0]
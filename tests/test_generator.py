@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from lrc import generator
+from lrc.compiler import BuildPlan
+from lrc.generator import realize
+from lrc.parser import Action
+
+
+def _plan(root: Path, actions: List[Action]) -> BuildPlan:
+    return BuildPlan(
+        source=root / "schema.lrc",
+        root=root,
+        actions=actions,
+        metadata={},
+        variables={},
+        ignores=[],
+        gpg_reports=[],
+        schema_signature=None,
+    )
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs POSIX modes and symlinks")
+def test_realize_applies_phases_regardless_of_schema_order(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    script = out / "bin" / "run.sh"
+    link = out / "links" / "run"
+    actions = [
+        Action(kind="chmod", path=script, mode=0o755),
+        Action(kind="symlink", path=link, target=script),
+        Action(kind="write", path=script, content="#!/bin/sh\n"),
+        Action(kind="mkdir", path=out / "links"),
+        Action(kind="mkdir", path=out / "bin"),
+    ]
+
+    result = realize(_plan(tmp_path, actions), out)
+
+    assert result.success
+    assert script.read_text() == "#!/bin/sh\n"
+    assert script.stat().st_mode & 0o777 == 0o755
+    assert link.is_symlink() and link.resolve() == script.resolve()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs POSIX symlinks")
+def test_write_after_symlink_at_same_path_keeps_schema_order(
+    tmp_path: Path, capsys
+) -> None:
+    out = tmp_path / "out"
+    target = out / "real.txt"
+    entry = out / "entry"
+    actions = [
+        Action(kind="write", path=target, content="real"),
+        Action(kind="symlink", path=entry, target=target),
+        Action(kind="write", path=entry, content="plain"),
+    ]
+
+    result = realize(_plan(tmp_path, actions), out)
+
+    assert entry.is_symlink()
+    assert target.read_text() == "real"
+    assert result.created_paths.count(entry) == 1
+    assert (
+        f"Skipping existing file (use --force to overwrite): {entry}"
+        in capsys.readouterr().out
+    )
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs POSIX symlinks")
+def test_symlink_after_write_at_same_path_keeps_schema_order(
+    tmp_path: Path, capsys
+) -> None:
+    out = tmp_path / "out"
+    entry = out / "entry"
+    actions = [
+        Action(kind="write", path=entry, content="plain"),
+        Action(kind="symlink", path=entry, target=out / "elsewhere"),
+    ]
+
+    realize(_plan(tmp_path, actions), out)
+
+    assert not entry.is_symlink()
+    assert entry.read_text() == "plain"
+    assert "Skipping existing symlink" in capsys.readouterr().out
+
+
+def test_verbose_output_follows_schema_order(tmp_path: Path, capsys) -> None:
+    out = tmp_path / "out"
+    actions = [
+        Action(kind="write", path=out / "z" / "last.txt", content="z"),
+        Action(kind="mkdir", path=out / "a" / "b"),
+        Action(kind="write", path=out / "a" / "first.txt", content="a"),
+        Action(kind="mkdir", path=out / "a"),
+    ]
+
+    realize(_plan(tmp_path, actions), out, verbose=True)
+
+    lines = [
+        line for line in capsys.readouterr().out.splitlines() if line.startswith("[")
+    ]
+    assert lines == [
+        f"[write] {out / 'z' / 'last.txt'} (1 bytes)",
+        f"[mkdir] {out / 'a' / 'b'}",
+        f"[write] {out / 'a' / 'first.txt'} (1 bytes)",
+        f"[mkdir] {out / 'a'}",
+    ]
+
+
+def test_realize_keeps_last_write_to_same_path(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    target = out / "notes.txt"
+    actions = [
+        Action(kind="write", path=target, content="first"),
+        Action(kind="write", path=target, content="second"),
+    ]
+
+    result = realize(_plan(tmp_path, actions), out, force=True)
+
+    assert result.success
+    assert target.read_text() == "second"
+
+
+def test_verbose_warnings_are_not_held_back(tmp_path: Path, capsys) -> None:
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "keep.txt").write_text("original")
+    actions = [
+        Action(kind="mkdir", path=out / "a"),
+        Action(kind="write", path=out / "keep.txt", content="new"),
+    ]
+
+    realize(_plan(tmp_path, actions), out, verbose=True)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("[WARN] Skipping existing file")
+    assert lines[1:] == [
+        f"[mkdir] {out / 'a'}",
+        f"[write] {out / 'keep.txt'} (3 bytes)",
+    ]
+
+
+def test_large_writes_go_through_mmap(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(generator, "_MMAP_THRESHOLD", 16)
+    out = tmp_path / "out"
+    blob = out / "blob.txt"
+    content = "héllo wörld ✓\n" * 64
+    actions = [Action(kind="write", path=blob, content=content)]
+
+    result = realize(_plan(tmp_path, actions), out)
+
+    assert result.success
+    assert blob.read_bytes() == content.encode("utf-8")
+
+
+def test_mmap_write_truncates_longer_file_with_force(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(generator, "_MMAP_THRESHOLD", 16)
+    out = tmp_path / "out"
+    out.mkdir()
+    blob = out / "blob.txt"
+    blob.write_text("x" * 4096)
+    actions = [Action(kind="write", path=blob, content="y" * 32)]
+
+    result = realize(_plan(tmp_path, actions), out, force=True)
+
+    assert result.success
+    assert blob.read_text() == "y" * 32
+
+
+def test_write_falls_back_when_mmap_is_refused(tmp_path: Path, monkeypatch) -> None:
+    def refuse(*args, **kwargs):
+        raise OSError("mmap not supported")
+
+    monkeypatch.setattr(generator, "_MMAP_THRESHOLD", 16)
+    monkeypatch.setattr(generator.mmap, "mmap", refuse)
+    blob = tmp_path / "blob.txt"
+
+    generator._write_file(str(blob), "z" * 64, force=False)
+
+    assert blob.read_text() == "z" * 64
+
+
+def test_write_without_force_keeps_existing_file(tmp_path: Path, capsys) -> None:
+    out = tmp_path / "out"
+    out.mkdir()
+    existing = out / "keep.txt"
+    existing.write_text("original")
+    actions = [Action(kind="write", path=existing, content="replacement")]
+
+    result = realize(_plan(tmp_path, actions), out)
+
+    assert existing.read_text() == "original"
+    assert existing not in result.created_paths
+    assert "Skipping existing file" in capsys.readouterr().out
+
+
+def test_file_blocking_a_directory_fails_only_its_actions(
+    tmp_path: Path, capsys
+) -> None:
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "docs").write_text("not a directory")
+    actions = [
+        Action(kind="mkdir", path=out / "docs"),
+        Action(kind="write", path=out / "docs" / "index.md", content="# Docs\n"),
+        Action(kind="write", path=out / "README.md", content="readme"),
+    ]
+
+    result = realize(_plan(tmp_path, actions), out)
+
+    assert not result.success
+    assert (out / "README.md").read_text() == "readme"
+    assert (out / "docs").read_text() == "not a directory"
+    captured = capsys.readouterr().out
+    assert f"[ERROR] Failed to create directory {out / 'docs'}" in captured
+    assert f"[ERROR] Failed to write {out / 'docs' / 'index.md'}" in captured
+
+
+def test_exists_confirms_listing_misses_where_case_folds(
+    tmp_path: Path, monkeypatch
+) -> None:
+    (tmp_path / "README.md").write_text("x")
+    # What a case-insensitive filesystem reports for README.md vs readme.md.
+    children = {tmp_path: {"readme.md"}}
+
+    monkeypatch.setattr(generator, "_FOLDS_CASE", False)
+    assert not generator._exists(tmp_path / "README.md", children)
+
+    monkeypatch.setattr(generator, "_FOLDS_CASE", True)
+    assert generator._exists(tmp_path / "README.md", children)
+
+
+def test_actions_behind_a_symlink_keep_schema_order(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    actions = [
+        Action(kind="mkdir", path=out / "real"),
+        Action(kind="mkdir", path=out / "link"),
+        Action(kind="symlink", path=out / "link", target=Path("real")),
+        Action(kind="mkdir", path=out / "link" / "sub"),
+        Action(kind="write", path=out / "link" / "b.txt", content="b"),
+        Action(kind="write", path=out / "a.txt", content="a"),
+    ]
+
+    phases = generator._order_actions(actions)
+
+    assert [[index for index, _ in phase] for phase in phases] == [
+        [0, 1],
+        [5],
+        [2, 3, 4],
+        [],
+    ]
+
+
+def test_directory_prepass_defers_paths_behind_symlinks(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    actions = [
+        Action(kind="mkdir", path=out / "real"),
+        Action(kind="symlink", path=out / "link", target=Path("real")),
+        Action(kind="mkdir", path=out / "link"),
+        Action(kind="write", path=out / "link" / "sub" / "b.txt", content="b"),
+        Action(kind="write", path=out / "linked.txt", content="c"),
+    ]
+
+    ready, behind_links = generator._collect_directories(actions, out)
+
+    assert ready == [out, out / "real"]
+    assert behind_links == [out / "link", out / "link" / "sub"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs POSIX symlinks")
+def test_directories_behind_a_symlink_are_made_through_it(
+    tmp_path: Path, capsys
+) -> None:
+    out = tmp_path / "out"
+    # What "/real/ a.txt, @symlink real link, /link/ sub/b.txt" plans.
+    actions = [
+        Action(kind="mkdir", path=out / "real"),
+        Action(kind="write", path=out / "real" / "a.txt", content=""),
+        Action(kind="symlink", path=out / "link", target=Path("real")),
+        Action(kind="mkdir", path=out / "link"),
+        Action(kind="mkdir", path=out / "link" / "sub"),
+        Action(kind="write", path=out / "link" / "sub" / "b.txt", content=""),
+    ]
+
+    result = realize(_plan(tmp_path, actions), out, verbose=True)
+
+    assert result.success
+    assert (out / "link").is_symlink()
+    assert (out / "real" / "sub" / "b.txt").is_file()
+    assert "Skipping existing symlink" not in capsys.readouterr().out
+
+
+def test_legacy_package_helpers_warn_and_delegate_to_core(tmp_path: Path) -> None:
+    from lrc import compiler, core
+
+    with pytest.deprecated_call():
+        assert generator.expand_vars("${A}-x", {"A": "1"}) == "1-x"
+    with pytest.deprecated_call():
+        actions = generator.template_actions("python-cli", tmp_path, {})
+    assert actions and all(isinstance(a, core.Action) for a in actions)
+    with pytest.deprecated_call():
+        result = compiler.realize([core.Action("mkdir", tmp_path / "d")], tmp_path)
+    assert result.success and (tmp_path / "d").is_dir()
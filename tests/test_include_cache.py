@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from lrc import parser
+from lrc.parser import ParseError, parse_schema
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(parser, "INCLUDE_CACHE_ENABLED", True)
+    monkeypatch.setattr(parser, "INCLUDE_CACHE_DIR", directory)
+    return directory
+
+
+def _entries(cache_dir: Path) -> list[Path]:
+    return sorted(cache_dir.glob("*.json")) if cache_dir.exists() else []
+
+
+def _writes(result, root: Path) -> dict[Path, str]:
+    return {
+        a.path.relative_to(root): a.content for a in result.actions if a.kind == "write"
+    }
+
+
+def test_cache_hit_is_reused_until_the_include_changes(
+    tmp_path: Path, cache_dir: Path
+) -> None:
+    base = tmp_path / "base"
+    base.mkdir()
+    include = base / "inc.lrc"
+    include.write_text("a.txt -> one\n")
+    out = tmp_path / "out"
+
+    assert _writes(parse_schema("@include inc.lrc\n", out, base), out) == {
+        Path("a.txt"): "one"
+    }
+    (entry,) = _entries(cache_dir)
+
+    data = json.loads(entry.read_text())
+    data["actions"][0]["content"] = "from-cache"
+    entry.write_text(json.dumps(data))
+    assert _writes(parse_schema("@include inc.lrc\n", out, base), out) == {
+        Path("a.txt"): "from-cache"
+    }
+
+    include.write_text("a.txt -> two\n")
+    assert _writes(parse_schema("@include inc.lrc\n", out, base), out) == {
+        Path("a.txt"): "two"
+    }
+    assert len(_entries(cache_dir)) == 2
+
+
+def test_editing_a_nested_include_invalidates_its_parent(
+    tmp_path: Path, cache_dir: Path
+) -> None:
+    base = tmp_path / "base"
+    (base / "sub").mkdir(parents=True)
+    (base / "inc.lrc").write_text("@include sub/nested.lrc\n")
+    nested = base / "sub" / "nested.lrc"
+    nested.write_text("a.txt -> one\n")
+    out = tmp_path / "out"
+
+    assert _writes(parse_schema("@include inc.lrc\n", out, base), out) == {
+        Path("a.txt"): "one"
+    }
+    assert _entries(cache_dir)
+
+    nested.write_text("a.txt -> two\n")
+    assert _writes(parse_schema("@include inc.lrc\n", out, base), out) == {
+        Path("a.txt"): "two"
+    }
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs POSIX symlinks")
+def test_retargeted_nested_include_misses_cache(
+    tmp_path: Path, cache_dir: Path
+) -> None:
+    base = tmp_path / "base"
+    for version in ("v1", "v2"):
+        (base / version).mkdir(parents=True)
+        (base / version / "nested.lrc").write_text(f"a.txt -> {version}\n")
+    (base / "sub").symlink_to(base / "v1")
+    (base / "inc.lrc").write_text("@include sub/nested.lrc\n")
+    out = tmp_path / "out"
+
+    assert _writes(parse_schema("@include inc.lrc\n", out, base), out) == {
+        Path("a.txt"): "v1"
+    }
+
+    (base / "sub").unlink()
+    (base / "sub").symlink_to(base / "v2")
+    assert _writes(parse_schema("@include inc.lrc\n", out, base), out) == {
+        Path("a.txt"): "v2"
+    }
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs POSIX symlinks")
+def test_nested_include_moved_outside_base_fails_despite_cache(
+    tmp_path: Path, cache_dir: Path
+) -> None:
+    base = tmp_path / "base"
+    (base / "v1").mkdir(parents=True)
+    (base / "v1" / "nested.lrc").write_text("a.txt -> v1\n")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "nested.lrc").write_text("a.txt -> v1\n")
+    (base / "sub").symlink_to(base / "v1")
+    (base / "inc.lrc").write_text("@include sub/nested.lrc\n")
+    out = tmp_path / "out"
+
+    parse_schema("@include inc.lrc\n", out, base)
+
+    (base / "sub").unlink()
+    (base / "sub").symlink_to(outside)
+    with pytest.raises(ParseError, match="path traversal"):
+        parse_schema("@include inc.lrc\n", out, base)
+
+
+def test_unverified_include_is_not_cached(
+    tmp_path: Path, cache_dir: Path, fake_gpg
+) -> None:
+    (tmp_path / "inc.lrc").write_text("a.txt -> one\n")
+    (tmp_path / "inc.lrc.asc").write_text("signature")
+    fake_gpg(returncode=1)
+
+    with pytest.raises(ParseError, match="verification failed"):
+        parse_schema("@include inc.lrc\n", tmp_path / "out", tmp_path)
+    assert _entries(cache_dir) == []
+
+
+def test_tampered_include_misses_cache_and_fails(
+    tmp_path: Path, cache_dir: Path, fake_gpg
+) -> None:
+    include = tmp_path / "inc.lrc"
+    include.write_text("a.txt -> one\n")
+    (tmp_path / "inc.lrc.asc").write_text("signature")
+    fake_gpg(returncode=0)
+    parse_schema("@include inc.lrc\n", tmp_path / "out", tmp_path)
+    assert len(_entries(cache_dir)) == 1
+
+    include.write_text("a.txt -> evil\n")
+    fake_gpg(returncode=1)
+    with pytest.raises(ParseError, match="verification failed"):
+        parse_schema("@include inc.lrc\n", tmp_path / "out", tmp_path)
+    assert len(_entries(cache_dir)) == 1
+
+
+def test_cached_copy_source_is_rechecked(tmp_path: Path, cache_dir: Path) -> None:
+    base = tmp_path / "base"
+    (base / "data").mkdir(parents=True)
+    (base / "data" / "f.txt").write_text("inside")
+    (base / "inc.lrc").write_text("@copy data/f.txt f.txt\n")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "f.txt").write_text("secret")
+
+    parse_schema("@include inc.lrc\n", tmp_path / "out", base)
+    assert len(_entries(cache_dir)) == 1
+
+    (base / "data" / "f.txt").unlink()
+    (base / "data").rmdir()
+    (base / "data").symlink_to(outside)
+    with pytest.raises(ParseError, match="traversal"):
+        parse_schema("@include inc.lrc\n", tmp_path / "out", base)
+
+
+def test_old_and_oversized_entries_are_pruned(
+    tmp_path: Path, cache_dir: Path, monkeypatch
+) -> None:
+    cache_dir.mkdir()
+    stale = cache_dir / "stale.json"
+    stale.write_text("{}")
+    os.utime(stale, (0, 0))
+    (tmp_path / "inc.lrc").write_text("a.txt -> one\n")
+
+    parse_schema("@include inc.lrc\n", tmp_path / "out", tmp_path)
+    assert not stale.exists()
+    assert len(_entries(cache_dir)) == 1
+
+    monkeypatch.setattr(parser, "_INCLUDE_CACHE_MAX_BYTES", 0)
+    (tmp_path / "inc.lrc").write_text("a.txt -> two\n")
+    parse_schema("@include inc.lrc\n", tmp_path / "out", tmp_path)
+    assert _entries(cache_dir) == []
@@ -17,3 +17,49 @@ def test_run_dat_audit_creates_summary(tmp_path):
     data = json.loads(audit_file.read_text())
     assert data["mocked"] is True
     assert summary["project"] == "demo-app"
+
+
+def test_capture_output_is_bounded(monkeypatch):
+    import sys
+
+    from lrc import integration
+
+    monkeypatch.setattr(integration, "_MAX_CAPTURE", 1000)
+    code, out, err = integration._capture_output(
+        [
+            sys.executable,
+            "-c",
+            "import sys; sys.stdout.write('x' * 300000); sys.stderr.write('e')",
+        ]
+    )
+    assert code == 0
+    assert out.startswith(b"x" * 1000)
+    assert out.endswith(b"[... 299000 bytes truncated]")
+    assert err == b"e"
+
+
+def test_capture_output_kills_the_child_when_draining_fails(monkeypatch):
+    import subprocess
+    import sys
+
+    import pytest
+
+    from lrc import integration
+
+    started = []
+    real_popen = subprocess.Popen
+
+    def popen(*args, **kwargs):
+        started.append(real_popen(*args, **kwargs))
+        return started[-1]
+
+    def broken_readv(fd, buffers):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(integration.subprocess, "Popen", popen)
+    monkeypatch.setattr(integration.os, "readv", broken_readv)
+    with pytest.raises(KeyboardInterrupt):
+        integration._capture_output(
+            [sys.executable, "-c", "import time; print(1, flush=True); time.sleep(60)"]
+        )
+    assert started[0].returncode is not None
@@ -10,7 +10,11 @@ def test_parse_basic_schema(tmp_path: Path) -> None:
     result = parse_schema(schema, tmp_path, Path("tests/data"))
     assert result.metadata["Project"] == "demo-app"
     assert result.variables["AUTHOR"] == "Unit Tester"
-    paths = {action.path.relative_to(tmp_path) for action in result.actions if action.kind == "write"}
+    paths = {
+        action.path.relative_to(tmp_path)
+        for action in result.actions
+        if action.kind == "write"
+    }
     assert Path("src/main.py") in paths
 
 
@@ -20,12 +24,149 @@ def test_template_expansion(tmp_path: Path) -> None:
 @template python-cli
 """
     result = parse_schema(schema, tmp_path, tmp_path)
-    written = {action.path.relative_to(tmp_path) for action in result.actions if action.kind == "write"}
+    written = {
+        action.path.relative_to(tmp_path)
+        for action in result.actions
+        if action.kind == "write"
+    }
     assert Path("pyproject.toml") in written
-    assert any("python" in action.content.lower() for action in result.actions if action.content)
+    assert any(
+        "python" in action.content.lower()
+        for action in result.actions
+        if action.content
+    )
 
 
 def test_invalid_directive_raises(tmp_path: Path) -> None:
     schema = "@unknown value"
     with pytest.raises(ParseError):
         parse_schema(schema, tmp_path, tmp_path)
+
+
+def test_lines_after_file_entries_are_parsed(tmp_path: Path) -> None:
+    schema = "/a\n  f.txt -> hi\n@set X=1\n  g.txt -> ${X}\n  h.txt\n# Version: 2.0\n"
+    result = parse_schema(schema, tmp_path, tmp_path)
+    assert result.variables["X"] == "1"
+    assert result.metadata["Version"] == "2.0"
+    written = {
+        action.path.relative_to(tmp_path): action.content
+        for action in result.actions
+        if action.kind == "write"
+    }
+    assert written == {Path("a/f.txt"): "hi", Path("a/g.txt"): "1", Path("a/h.txt"): ""}
+
+
+def test_include_containment_follows_repointed_base(tmp_path: Path) -> None:
+    (tmp_path / "X").mkdir()
+    (tmp_path / "Y").mkdir()
+    (tmp_path / "X" / "secret.lrc").write_text("leak.txt -> secret\n")
+    base = tmp_path / "A"
+    base.symlink_to(tmp_path / "X")
+    parse_schema("README.md\n", tmp_path / "out", base)
+
+    base.unlink()
+    base.symlink_to(tmp_path / "Y")
+    with pytest.raises(ParseError, match="path traversal"):
+        parse_schema("@include ../X/secret.lrc\n", tmp_path / "out", base)
+
+
+def test_directive_arguments_may_be_tab_separated(tmp_path: Path) -> None:
+    result = parse_schema("@set\tX=1\n@ignore\t*.log\n", tmp_path, tmp_path)
+    assert result.variables["X"] == "1"
+    assert result.ignores == ["*.log"]
+
+
+def test_missing_pgp_keyring_names_the_path(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "inc.lrc").write_text("a.txt\n")
+    (tmp_path / "inc.lrc.asc").write_text("signature")
+    keyring = tmp_path / "missing-keyring.asc"
+    monkeypatch.setenv("LRC_GPG_KEYRING", str(keyring))
+    with pytest.raises(ParseError, match="missing-keyring.asc") as excinfo:
+        parse_schema("\n@include inc.lrc\n", tmp_path / "out", tmp_path)
+    assert excinfo.value.line_num == 2
+
+
+def test_unparseable_pgp_keyring_names_the_path(tmp_path: Path, monkeypatch) -> None:
+    pytest.importorskip("pgpy")
+    (tmp_path / "inc.lrc").write_text("a.txt\n")
+    (tmp_path / "inc.lrc.asc").write_text("signature")
+    keyring = tmp_path / "garbage-keyring.asc"
+    keyring.write_text("not a key")
+    monkeypatch.setenv("LRC_GPG_KEYRING", str(keyring))
+    with pytest.raises(ParseError, match="garbage-keyring.asc"):
+        parse_schema("@include inc.lrc\n", tmp_path / "out", tmp_path)
+
+
+def test_deferred_signature_failure_reports_include_line(
+    tmp_path: Path, monkeypatch, fake_gpg
+) -> None:
+    import subprocess
+    import sys
+
+    from lrc import parser
+
+    real_popen = subprocess.Popen
+    calls = []
+
+    def popen(cmd, **kwargs):
+        calls.append(cmd)
+        script = "import sys; sys.stderr.write('BAD signature'); sys.exit(1)"
+        return real_popen([sys.executable, "-c", script], **kwargs)
+
+    fake_gpg(popen=popen)
+    monkeypatch.setattr(parser, "INCLUDE_CACHE_ENABLED", False)
+    (tmp_path / "inc.lrc").write_text("a.txt\n")
+    (tmp_path / "inc.lrc.asc").write_text("signature")
+    schema = "\nREADME.md\n\n@include inc.lrc\n"
+    with pytest.raises(ParseError, match="inc.lrc") as excinfo:
+        parse_schema(schema, tmp_path / "out", tmp_path)
+    assert excinfo.value.line_num == 4
+    assert "BAD signature" in excinfo.value.line_content
+    assert calls and calls[0][:2] == ["gpg", "--verify"]
+
+
+def test_failed_gpg_spawn_reaps_started_processes(
+    tmp_path: Path, monkeypatch, fake_gpg
+) -> None:
+    import subprocess
+    import sys
+
+    from lrc.parser import GPGReport, verify_pending_signatures
+
+    real_popen = subprocess.Popen
+    started = []
+
+    def popen(cmd, **kwargs):
+        if started:
+            raise OSError("spawn failed")
+        proc = real_popen(
+            [sys.executable, "-c", "import time; time.sleep(60)"], **kwargs
+        )
+        started.append(proc)
+        return proc
+
+    from lrc import parser
+
+    fake_gpg(popen=popen)
+    monkeypatch.setattr(parser, "_GPG_PARALLEL", 2)
+    pending = [
+        (
+            tmp_path / f"inc{i}.lrc",
+            tmp_path / f"inc{i}.lrc.asc",
+            i + 1,
+            "",
+            GPGReport(str(i), False),
+        )
+        for i in range(2)
+    ]
+    with pytest.raises(OSError, match="spawn failed"):
+        verify_pending_signatures(pending, verbose=False)
+    assert started[0].returncode is not None
+
+
+def test_result_still_unpacks_like_the_legacy_tuple(tmp_path: Path) -> None:
+    result = parse_schema("# Project: demo\n/src\n", tmp_path, tmp_path, False)
+    with pytest.deprecated_call():
+        actions, meta, vars_ = result
+    assert actions is result.actions
+    assert meta["Project"] == vars_["PROJECT"] == "demo"